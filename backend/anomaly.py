@@ -0,0 +1,214 @@
+"""Online anomaly detection on ingested tag samples.
+
+Each tag keeps an EWMA mean and variance, the z-score of every new sample
+against them, and two-sided CUSUM sums of that z-score: a constant amount
+of state per tag. A batch is processed without a per-sample Python loop:
+the EWMA recursions are solved in closed form over blocks, and CUSUM uses
+the running-minimum form of its reset-at-zero recursion.
+
+Alerts fire when ``|z|`` rises above ``Z_LIMIT`` (a spike) and when a
+CUSUM sum rises above ``CUSUM_H`` (a sustained drift up or down; it
+re-arms once the sum falls below half of that), and are published on an
+``AlertFeed``.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+from .historian import advancing
+from .live import Broadcaster, sse_message
+
+ALPHA = 0.02            # EWMA weight of each new sample
+WARMUP = 50             # samples per tag before alerts are raised
+Z_LIMIT = 4.0           # spike threshold, in EWMA standard deviations
+CUSUM_K = 0.5           # CUSUM slack, in standard deviations
+CUSUM_H = 8.0           # CUSUM decision threshold; the alarm clears below half of it
+MAX_ALERTS_PER_BATCH = 100
+BIAS_HORIZON = 2000     # samples after which the variance start-up bias is negligible
+
+
+def linear_recursion(y0: float, b: float, u: np.ndarray) -> np.ndarray:
+    """Return ``y_k = b * y_(k-1) + u_k`` for every ``k``, starting from ``y0``.
+
+    Uses ``y_k = b**k * (y0 + sum_j u_j / b**j)`` over blocks short enough
+    that ``b**-k`` stays finite.
+    """
+    n = len(u)
+    out = np.empty(n)
+    block = n if b >= 1.0 else max(1, min(n, int(600.0 / -np.log(b))))
+    powers = b ** np.arange(1, block + 1)
+    for lo in range(0, n, block):
+        seg = u[lo:lo + block]
+        p = powers[:len(seg)]
+        out[lo:lo + len(seg)] = p * (y0 + np.cumsum(seg / p))
+        y0 = out[lo + len(seg) - 1]
+    return out
+
+
+def cusum(s0: float, d: np.ndarray) -> np.ndarray:
+    """Return ``s_k = max(0, s_(k-1) + d_k)`` for every ``k``, starting from ``s0``."""
+    c = s0 + np.cumsum(d)
+    return c - np.minimum(np.minimum.accumulate(c), 0.0)
+
+
+def latch(on: np.ndarray, off: np.ndarray, before: bool) -> np.ndarray:
+    """Alarm state per sample: set where ``on``, cleared where ``off``, otherwise held."""
+    events = np.where(on | off, np.arange(len(on)), -1)
+    last = np.maximum.accumulate(events)
+    return np.where(last >= 0, on[np.maximum(last, 0)], before)
+
+
+def rising(flags: np.ndarray, before: bool) -> np.ndarray:
+    """Indices where ``flags`` turns true, given the flag before the batch."""
+    return np.flatnonzero(flags & ~np.r_[before, flags[:-1]])
+
+
+class TagDetector:
+    """EWMA, z-score and CUSUM state of one tag."""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.n = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.cusum_up = 0.0
+        self.cusum_down = 0.0
+        self.last_t = -np.inf
+        self.last_z = 0.0
+        self.alarms = {"spike": False, "drift_up": False, "drift_down": False}
+        self._lock = threading.Lock()
+
+    def process(self, t, x) -> list:
+        """Update the state with samples later than the previous one; returns the alerts raised."""
+        t = np.asarray(t, dtype=np.float64)
+        x = np.asarray(x, dtype=np.float64)
+        with self._lock:
+            keep = advancing(t, self.last_t) & np.isfinite(x)
+            if not keep.all():
+                t, x = t[keep], x[keep]
+            if len(t) == 0:
+                return []
+            if self.n == 0:
+                self.mean = float(x[0])
+
+            a, b = ALPHA, 1.0 - ALPHA
+            means = linear_recursion(self.mean, b, a * x)
+            prev_mean = np.r_[self.mean, means[:-1]]
+            resid = x - prev_mean
+            variances = linear_recursion(self.var, b, a * b * resid ** 2)
+            prev_var = np.r_[self.var, variances[:-1]]
+            # The variance starts at zero; divide out that bias as Adam-style EWMAs do
+            young = min(max(BIAS_HORIZON - self.n, 0), len(x))
+            if young:
+                seen = np.arange(self.n, self.n + young)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    prev_var[:young] /= 1.0 - b ** seen
+            prev_std = np.sqrt(prev_var)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z = np.where(prev_std > 0, resid / prev_std, 0.0)
+            z[:min(max(WARMUP - self.n, 0), len(z))] = 0.0
+
+            # Clipped so that a single spike cannot trip the drift alarms on its own
+            zc = np.clip(z, -Z_LIMIT, Z_LIMIT)
+            up = cusum(self.cusum_up, zc - CUSUM_K)
+            down = cusum(self.cusum_down, -zc - CUSUM_K)
+
+            alerts = []
+            spikes = np.abs(z) > Z_LIMIT
+            for kind, state in (
+                ("spike", spikes),
+                ("drift_up", latch(up > CUSUM_H, up < CUSUM_H / 2, self.alarms["drift_up"])),
+                ("drift_down", latch(down > CUSUM_H, down < CUSUM_H / 2, self.alarms["drift_down"])),
+            ):
+                idx = rising(state, self.alarms[kind])
+                self.alarms[kind] = bool(state[-1])
+                for i in idx[:MAX_ALERTS_PER_BATCH].tolist():
+                    alerts.append({
+                        "tag": self.tag,
+                        "kind": kind,
+                        "t": float(t[i]),
+                        "value": float(x[i]),
+                        "z": float(z[i]),
+                        "cusum": float(down[i] if kind == "drift_down" else up[i]),
+                        "mean": float(prev_mean[i]),
+                        "std": float(prev_std[i]),
+                    })
+
+            self.n += len(x)
+            self.mean, self.var = float(means[-1]), float(variances[-1])
+            self.cusum_up, self.cusum_down = float(up[-1]), float(down[-1])
+            self.last_t, self.last_z = float(t[-1]), float(z[-1])
+            alerts.sort(key=lambda alert: alert["t"])
+            return alerts[:MAX_ALERTS_PER_BATCH]
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "samples": self.n,
+                "mean": self.mean,
+                "std": float(np.sqrt(self.var)),
+                "z": self.last_z,
+                "cusum_up": self.cusum_up,
+                "cusum_down": self.cusum_down,
+                "warming_up": self.n < WARMUP,
+                "alarms": [kind for kind, active in self.alarms.items() if active],
+            }
+
+
+class AlertFeed(Broadcaster):
+    """Recent alerts, pushed to subscribers as ``alerts`` events."""
+
+    def __init__(self, keep: int = 1000, backlog: int = 1024):
+        super().__init__(backlog)
+        self.recent = deque(maxlen=keep)
+        self.next_id = 1
+
+    def publish(self, alerts: list):
+        """Number ``alerts``, keep them and push them in one message."""
+        if not alerts:
+            return
+        with self._lock:
+            for alert in alerts:
+                alert["id"] = self.next_id
+                self.next_id += 1
+            self.recent.extend(alerts)
+            self._append("alerts", {"alerts": alerts})
+        self._notify()
+
+    def list(self, tag: str = None, since: int = 0, limit: int = 100) -> list:
+        """Return up to ``limit`` of the newest alerts with id above ``since``, newest first."""
+        with self._lock:
+            alerts = [a for a in reversed(self.recent) if a["id"] > since and (tag is None or a["tag"] == tag)]
+        return alerts[:limit]
+
+    def snapshot(self):
+        """Return ``(version, encoded snapshot message)`` with the 50 newest alerts."""
+        with self._lock:
+            alerts = list(self.recent)[-50:]
+            return self.version, sse_message("snapshot", self.version, {"version": self.version, "alerts": alerts})
+
+
+class AnomalyDetector:
+    """Per-tag detectors feeding one ``AlertFeed``."""
+
+    def __init__(self, feed: AlertFeed):
+        self.feed = feed
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def process(self, tag: str, t, v) -> list:
+        """Run the detector of ``tag`` over new samples and publish any alerts."""
+        with self._lock:
+            detector = self._tags.get(tag)
+            if detector is None:
+                detector = self._tags[tag] = TagDetector(tag)
+        alerts = detector.process(t, v)
+        self.feed.publish(alerts)
+        return alerts
+
+    def state(self) -> dict:
+        with self._lock:
+            detectors = dict(self._tags)
+        return {tag: d.state() for tag, d in sorted(detectors.items())}
@@ -0,0 +1,247 @@
+"""Append-only on-disk tag archive of memory-mapped columnar chunk files.
+
+Each tag has a directory of chunk files, one or more per time partition
+(a UTC day by default). A chunk is preallocated to a fixed number of rows
+and laid out as::
+
+    64-byte header (HEADER: magic "DSCH", version, capacity, row count,
+                    partition start, partition span)
+    capacity x float64 timestamps (Unix seconds, little-endian)
+    capacity x float32 values
+
+Chunks are opened with ``numpy.memmap``, so reads are slices of the mapped
+columns and only the pages a query touches are read from disk. The sparse
+index keeps each chunk's first and last timestamp, so a range query opens
+only the chunks that overlap it.
+"""
+
+import bisect
+import math
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .downsample import concat
+from .historian import TAG_PATTERN, advancing
+
+HEADER = struct.Struct("<4sHHI4xqdd")
+HEADER_SIZE = 64
+MAGIC = b"DSCH"
+VERSION = 1
+DEFAULT_SPAN = 86400.0          # one partition per UTC day
+DEFAULT_CHUNK_ROWS = 1 << 17    # 1.5 Hz for a day, about 1.5 MB per chunk
+
+
+class Chunk:
+    """One memory-mapped chunk file."""
+
+    def __init__(self, path: Path, capacity: int = None, start: float = None, span: float = None):
+        if capacity is not None and not path.exists():
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, capacity, 0, start, span).ljust(HEADER_SIZE, b"\0"))
+                f.truncate(HEADER_SIZE + capacity * 12)
+        self.path = path
+        self.buf = np.memmap(path, dtype=np.uint8, mode="r+")
+        magic, version, _, self.capacity, _, self.start, self.span = HEADER.unpack_from(self.buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} archive chunk")
+        t_end = HEADER_SIZE + self.capacity * 8
+        self.t = self.buf[HEADER_SIZE:t_end].view("<f8")
+        self.v = self.buf[t_end:t_end + self.capacity * 4].view("<f4")
+        self._count = self.buf[16:24].view("<i8")
+
+    @property
+    def count(self) -> int:
+        return int(self._count[0])
+
+    def append(self, t: np.ndarray, v: np.ndarray) -> int:
+        """Write as many samples as fit; returns how many were written."""
+        n = min(len(t), self.capacity - self.count)
+        c = self.count
+        self.t[c:c + n] = t[:n]
+        self.v[c:c + n] = v[:n]
+        # Rows first, then the count, so a reader never sees unwritten rows
+        self._count[0] = c + n
+        return n
+
+    def flush(self):
+        self.buf.flush()
+
+
+class TagArchive:
+    """Chunk index and writer for one tag."""
+
+    def __init__(self, directory: Path, span: float, chunk_rows: int, open_chunks):
+        self.directory = directory
+        self.span = span
+        self.chunk_rows = chunk_rows
+        self._open = open_chunks
+        self.paths = []     # chunk files in time order
+        self.first = []     # first timestamp of each chunk (sparse index)
+        self.last = []      # last timestamp of each chunk
+        self.rejected = 0
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(directory.glob("*.chunk"), key=lambda p: tuple(map(int, p.stem.split("_")))):
+            chunk = self._open(path)
+            if chunk.count:
+                self.paths.append(path)
+                self.first.append(float(chunk.t[0]))
+                self.last.append(float(chunk.t[chunk.count - 1]))
+
+    @property
+    def last_t(self) -> float:
+        return self.last[-1] if self.last else -math.inf
+
+    def _tail(self, partition: int) -> Chunk:
+        """Return the newest writable chunk of ``partition``, creating one if needed; caller holds the lock."""
+        if self.paths:
+            part, seq = map(int, self.paths[-1].stem.split("_"))
+            if part == partition:
+                chunk = self._open(self.paths[-1])
+                if chunk.count < chunk.capacity:
+                    return chunk
+                seq += 1
+            else:
+                seq = 0
+        else:
+            seq = 0
+        path = self.directory / f"{partition}_{seq}.chunk"
+        chunk = self._open(path, self.chunk_rows, partition * self.span, self.span)
+        self.paths.append(path)
+        self.first.append(math.nan)
+        self.last.append(math.nan)
+        return chunk
+
+    def append(self, t: np.ndarray, v: np.ndarray) -> int:
+        """Append samples later than the last archived one; returns how many were kept."""
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float32)
+        with self._lock:
+            if len(t):
+                keep = advancing(t, self.last_t)
+                if not keep.all():
+                    self.rejected += int(len(t) - keep.sum())
+                    t, v = t[keep], v[keep]
+            partitions = np.floor(t / self.span).astype(np.int64)
+            # Split the batch at partition boundaries, then fill chunks in order
+            bounds = np.flatnonzero(np.diff(partitions)) + 1
+            for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(t)]):
+                while lo < hi:
+                    chunk = self._tail(int(partitions[lo]))
+                    n = chunk.append(t[lo:hi], v[lo:hi])
+                    if math.isnan(self.first[-1]):
+                        self.first[-1] = float(t[lo])
+                    self.last[-1] = float(t[lo + n - 1])
+                    lo += n
+            return len(t)
+
+    def chunks(self, start: float = None, end: float = None):
+        """Yield the chunks overlapping ``[start, end]`` in time order."""
+        with self._lock:
+            lo = 0 if start is None else bisect.bisect_left(self.last, start)
+            hi = len(self.paths) if end is None else bisect.bisect_right(self.first, end)
+            paths = self.paths[lo:hi]
+        for path in paths:
+            yield self._open(path)
+
+    def iter_range(self, start: float = None, end: float = None):
+        """Yield ``(t, v)`` views into the mapped chunks for ``start <= t <= end``."""
+        for chunk in self.chunks(start, end):
+            n = chunk.count
+            t = chunk.t[:n]
+            lo = 0 if start is None else int(np.searchsorted(t, start, side="left"))
+            hi = n if end is None else int(np.searchsorted(t, end, side="right"))
+            if hi > lo:
+                yield t[lo:hi], chunk.v[lo:hi]
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "chunks": len(self.paths),
+                "first": self.first[0] if self.first else None,
+                "last": self.last[-1] if self.last else None,
+                "rejected": self.rejected,
+                "bytes": sum(p.stat().st_size for p in self.paths),
+            }
+
+
+class Archive:
+    """Tag archives under ``root``, one directory per tag.
+
+    At most ``max_open`` chunk files stay mapped; the least recently used
+    are closed first.
+    """
+
+    def __init__(self, root, span: float = DEFAULT_SPAN, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 max_open: int = 256):
+        self.root = Path(root)
+        self.span = span
+        self.chunk_rows = chunk_rows
+        self.max_open = max_open
+        self._chunks = OrderedDict()
+        self._chunks_lock = threading.Lock()
+        self._tags = {}
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        for directory in sorted(p for p in self.root.iterdir() if p.is_dir() and TAG_PATTERN.match(p.name)):
+            self._tags[directory.name] = TagArchive(directory, span, chunk_rows, self._open_chunk)
+
+    def _open_chunk(self, path: Path, capacity: int = None, start: float = None, span: float = None) -> Chunk:
+        """Return the mapped chunk for ``path``, creating the file when ``capacity`` is given."""
+        with self._chunks_lock:
+            chunk = self._chunks.get(path)
+            if chunk is None:
+                chunk = self._chunks[path] = Chunk(path, capacity, start, span)
+                while len(self._chunks) > self.max_open:
+                    _, old = self._chunks.popitem(last=False)
+                    old.flush()
+            self._chunks.move_to_end(path)
+            return chunk
+
+    def tag(self, tag: str, create: bool = False):
+        """Return the archive of ``tag``; with ``create`` make it if missing."""
+        with self._lock:
+            archive = self._tags.get(tag)
+            if archive is None and create:
+                if not TAG_PATTERN.match(tag):
+                    raise ValueError(f"Invalid tag name: {tag!r}")
+                archive = self._tags[tag] = TagArchive(self.root / tag, self.span, self.chunk_rows,
+                                                       self._open_chunk)
+            return archive
+
+    def append(self, tag: str, t, v) -> int:
+        """Append samples for ``tag``; ``t`` and ``v`` must have the same length."""
+        if len(t) != len(v):
+            raise ValueError(f"Tag {tag!r}: {len(t)} timestamps but {len(v)} values")
+        return self.tag(tag, create=True).append(t, v)
+
+    def parts(self, tag: str, start: float = None, end: float = None) -> list:
+        """Return ``(t, v)`` views into each chunk's slice of ``start..end``; raises ``KeyError`` if unknown."""
+        archive = self.tag(tag)
+        if archive is None:
+            raise KeyError(tag)
+        return list(archive.iter_range(start, end))
+
+    def range(self, tag: str, start: float = None, end: float = None):
+        """Return ``(t, v)`` for ``tag`` between ``start`` and ``end``; raises ``KeyError`` if unknown.
+
+        A range inside one chunk is returned as views of the mapping;
+        ranges spanning chunks are concatenated.
+        """
+        return concat(self.parts(tag, start, end))
+
+    def tags(self) -> dict:
+        """Return per-tag chunk counts and time span, keyed by tag name."""
+        with self._lock:
+            archives = dict(self._tags)
+        return {tag: archive.info() for tag, archive in sorted(archives.items())}
+
+    def flush(self):
+        """Write every mapped chunk back to disk."""
+        with self._chunks_lock:
+            for chunk in self._chunks.values():
+                chunk.flush()
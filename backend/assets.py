@@ -0,0 +1,300 @@
+"""Predictive-maintenance indicators for a fleet of assets.
+
+Each asset can carry three signals: a fouling index (percent of fully
+fouled), a pressure drop and, for transformers, the load. Every signal
+keeps exponentially weighted sums (time constant ``TAU``) from which its
+weighted mean and least-squares trend slope follow; a batch of samples
+updates them with a few vector operations, independent of the history
+seen. The sums are column arrays with one row per asset, so scoring,
+filtering, sorting and paging thousands of assets is a handful of NumPy
+operations per listing.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+from .historian import TAG_PATTERN, advancing
+
+SIGNALS = ("fouling", "dp", "load")
+TAU = 3 * 86400.0           # seconds; older samples weigh exp(-age / TAU)
+DAY = 86400.0
+FOULING_LIMIT = 80.0        # fouling index (%) at which cleaning is due
+FOULING_SLOPE_LIMIT = 2.0   # fouling rise (% per day) scored as fully degraded
+DP_DRIFT_LIMIT = 0.3        # pressure-drop rise over its baseline at which action is due
+LOAD_WARN = 0.8             # load factor where the transformer starts losing health
+BASELINE_SAMPLES = 100      # first pressure-drop samples averaged into the baseline
+MIN_TREND_SAMPLES = 3
+PENALTIES = {"fouling": 40.0, "dp": 30.0, "load": 30.0}  # health points lost at each limit
+FAILURE_MODES = {"fouling": "Fouling", "dp": "Pressure drop", "load": "Overload"}
+RISK_LEVELS = ("low", "medium", "high")
+SORT_KEYS = ("health", "days_to_action", "fouling_slope", "dp_drift", "load_factor", "name")
+HISTORY_STEP = 3600.0       # seconds between points of the fleet fouling history
+HISTORY_POINTS = 48
+SUMS = ("w", "wt", "wv", "wtt", "wtv")
+
+
+class AssetFleet:
+    """Asset metadata and per-signal weighted sums, one array row per asset."""
+
+    def __init__(self, capacity: int = 1024):
+        self.ids = []
+        self.index = {}
+        self.meta = []              # name, area, kind, impact per asset
+        self.rated_load = np.ones(capacity)
+        self.dp_baseline_sum = np.zeros(capacity)
+        self.dp_baseline_n = np.zeros(capacity, dtype=np.int64)
+        # signal -> column -> array; time is in days relative to last_t
+        self.columns = {
+            signal: {
+                **{name: np.zeros(capacity) for name in SUMS},
+                "last_t": np.full(capacity, -np.inf),
+                "last_v": np.full(capacity, np.nan),
+                "count": np.zeros(capacity, dtype=np.int64),
+            }
+            for signal in SIGNALS
+        }
+        self.history = deque(maxlen=HISTORY_POINTS)  # (t, mean fouling index)
+        self._history_bucket = None
+        self._lock = threading.Lock()
+
+    def _grow(self):
+        capacity = 2 * len(self.rated_load)
+        self.rated_load = np.resize(self.rated_load, capacity)
+        self.dp_baseline_sum = np.resize(self.dp_baseline_sum, capacity)
+        self.dp_baseline_n = np.resize(self.dp_baseline_n, capacity)
+        for columns in self.columns.values():
+            for name, array in columns.items():
+                columns[name] = np.resize(array, capacity)
+
+    def _row(self, asset_id: str) -> int:
+        """Row of ``asset_id``, adding the asset with default metadata if new; caller holds the lock."""
+        row = self.index.get(asset_id)
+        if row is not None:
+            return row
+        if not TAG_PATTERN.match(asset_id):
+            raise ValueError(f"Invalid asset id: {asset_id!r}")
+        row = len(self.ids)
+        if row == len(self.rated_load):
+            self._grow()
+        self.ids.append(asset_id)
+        self.index[asset_id] = row
+        self.meta.append({"name": asset_id, "area": "", "kind": "", "impact": "Medium"})
+        self.rated_load[row] = 1.0
+        self.dp_baseline_sum[row] = 0.0
+        self.dp_baseline_n[row] = 0
+        for columns in self.columns.values():
+            for name in SUMS:
+                columns[name][row] = 0.0
+            columns["last_t"][row] = -np.inf
+            columns["last_v"][row] = np.nan
+            columns["count"][row] = 0
+        return row
+
+    def register(self, asset_id: str, name: str = None, area: str = None, kind: str = None,
+                 impact: str = None, rated_load: float = None):
+        """Add ``asset_id`` or update the metadata fields given."""
+        with self._lock:
+            row = self._row(asset_id)
+            meta = self.meta[row]
+            for key, value in (("name", name), ("area", area), ("kind", kind), ("impact", impact)):
+                if value is not None:
+                    meta[key] = value
+            if rated_load is not None:
+                self.rated_load[row] = rated_load
+
+    def ingest(self, samples: dict) -> dict:
+        """Fold in ``{asset_id: {signal: (t, v)}}``; returns the samples kept per asset."""
+        for signals in samples.values():
+            unknown = set(signals) - set(SIGNALS)
+            if unknown:
+                raise ValueError(f"Unknown signals: {', '.join(sorted(unknown))}")
+        kept = {}
+        with self._lock:
+            newest = -np.inf
+            for asset_id, signals in samples.items():
+                row = self._row(asset_id)
+                kept[asset_id] = 0
+                for signal, (t, v) in signals.items():
+                    if len(t) != len(v):
+                        raise ValueError(f"Asset {asset_id!r} {signal}: {len(t)} timestamps but {len(v)} values")
+                    kept[asset_id] += self._update(signal, row, t, v)
+                    if len(t):
+                        newest = max(newest, self.columns[signal]["last_t"][row])
+            if np.isfinite(newest):
+                bucket = int(newest // HISTORY_STEP)
+                if self._history_bucket is None or bucket > self._history_bucket:
+                    self._history_bucket = bucket
+                    level = self._indicators()["fouling_level"]
+                    level = level[np.isfinite(level)]
+                    if len(level):
+                        self.history.append((float(newest), float(level.mean())))
+        return kept
+
+    def _update(self, signal: str, row: int, t, v) -> int:
+        """Fold samples later than the signal's newest into its sums; caller holds the lock."""
+        c = self.columns[signal]
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        keep = advancing(t, c["last_t"][row]) & np.isfinite(v)
+        if not keep.all():
+            t, v = t[keep], v[keep]
+        if len(t) == 0:
+            return 0
+        now = t[-1]
+        if c["count"][row]:
+            # Move the time origin to the new newest sample, then age the old sums
+            d = (now - c["last_t"][row]) / DAY
+            w, wt, wv = c["w"][row], c["wt"][row], c["wv"][row]
+            c["wtt"][row] += d * d * w - 2.0 * d * wt
+            c["wtv"][row] -= d * wv
+            c["wt"][row] -= d * w
+            decay = np.exp(-d * DAY / TAU)
+            for name in SUMS:
+                c[name][row] *= decay
+        tau = (t - now) / DAY
+        w = np.exp((t - now) / TAU)
+        c["w"][row] += w.sum()
+        c["wt"][row] += w @ tau
+        c["wv"][row] += w @ v
+        c["wtt"][row] += w @ (tau * tau)
+        c["wtv"][row] += w @ (tau * v)
+        c["last_t"][row], c["last_v"][row] = now, v[-1]
+        c["count"][row] += len(t)
+        if signal == "dp" and self.dp_baseline_n[row] < BASELINE_SAMPLES:
+            first = v[:BASELINE_SAMPLES - self.dp_baseline_n[row]]
+            self.dp_baseline_sum[row] += first.sum()
+            self.dp_baseline_n[row] += len(first)
+        return len(t)
+
+    def _trend(self, signal: str, n: int):
+        """Weighted mean, trend slope (per day) and fitted current value of ``signal`` for the first ``n`` rows."""
+        c = {name: array[:n] for name, array in self.columns[signal].items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = c["wv"] / c["w"]
+            denom = c["w"] * c["wtt"] - c["wt"] ** 2
+            slope = np.where((c["count"] >= MIN_TREND_SAMPLES) & (denom > 1e-12 * c["w"] ** 2),
+                             (c["w"] * c["wtv"] - c["wt"] * c["wv"]) / denom, np.nan)
+            level = mean - np.nan_to_num(slope) * c["wt"] / c["w"]
+        return mean, slope, level
+
+    def _indicators(self) -> dict:
+        """Degradation indicators, health and risk of every asset; caller holds the lock."""
+        n = len(self.ids)
+        _, fouling_slope, fouling_level = self._trend("fouling", n)
+        dp_mean, dp_slope, dp_level = self._trend("dp", n)
+        load_mean, _, _ = self._trend("load", n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            baseline = self.dp_baseline_sum[:n] / self.dp_baseline_n[:n]
+            dp_drift = dp_mean / baseline - 1.0
+            load_factor = load_mean / self.rated_load[:n]
+
+            penalty = np.column_stack([
+                np.fmax(fouling_level / FOULING_LIMIT, fouling_slope / FOULING_SLOPE_LIMIT),
+                dp_drift / DP_DRIFT_LIMIT,
+                (load_factor - LOAD_WARN) / (1.0 - LOAD_WARN),
+            ])
+            penalty = np.clip(np.nan_to_num(penalty), 0.0, 1.0) * np.array([PENALTIES[s] for s in SIGNALS])
+            health = 100.0 - penalty.sum(axis=1)
+
+            # Days until the fitted trend reaches its limit; inf while it is not heading there
+            fouling_days = np.where(fouling_slope > 0, (FOULING_LIMIT - fouling_level) / fouling_slope, np.inf)
+            dp_days = np.where(dp_slope > 0, (baseline * (1.0 + DP_DRIFT_LIMIT) - dp_level) / dp_slope, np.inf)
+            days = np.fmax(np.fmin(np.where(np.isnan(fouling_days), np.inf, fouling_days),
+                                   np.where(np.isnan(dp_days), np.inf, dp_days)), 0.0)
+            days = np.where(load_factor >= 1.0, 0.0, days)
+
+        risk = np.where(health < 40.0, 2, np.where(health < 70.0, 1, 0))
+        mode = np.where(penalty.max(axis=1) >= 5.0, penalty.argmax(axis=1), -1)
+        return {
+            "health": health,
+            "risk": risk,
+            "mode": mode,
+            "days_to_action": days,
+            "fouling_level": fouling_level,
+            "fouling_slope": fouling_slope,
+            "dp_drift": dp_drift,
+            "load_factor": load_factor,
+        }
+
+    def listing(self, risk: str = None, area: str = None, kind: str = None, q: str = None,
+                due_within: float = None, sort: str = "health", order: str = "asc",
+                page: int = 1, page_size: int = 50) -> dict:
+        """Filtered, sorted page of assets plus a summary of the whole fleet."""
+        if risk is not None and risk not in RISK_LEVELS:
+            raise ValueError(f"risk must be one of {', '.join(RISK_LEVELS)}")
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        if page < 1 or not 1 <= page_size <= 1000:
+            raise ValueError("page must be at least 1 and page_size between 1 and 1000")
+        with self._lock:
+            ind = self._indicators()
+            ids = np.array(self.ids, dtype=object)
+            meta = list(self.meta)
+            history = list(self.history)
+            last_t = np.fmax.reduce([self.columns[s]["last_t"][:len(ids)] for s in SIGNALS]) \
+                if len(ids) else np.empty(0)
+
+        mask = np.ones(len(ids), dtype=bool)
+        if risk is not None:
+            mask &= ind["risk"] == RISK_LEVELS.index(risk)
+        if area is not None:
+            mask &= np.array([m["area"] == area for m in meta], dtype=bool)
+        if kind is not None:
+            mask &= np.array([m["kind"] == kind for m in meta], dtype=bool)
+        if q:
+            needle = q.lower()
+            mask &= np.array([needle in i.lower() or needle in m["name"].lower() for i, m in zip(ids, meta)],
+                             dtype=bool)
+        if due_within is not None:
+            mask &= ind["days_to_action"] <= due_within
+        rows = np.flatnonzero(mask)
+
+        if sort == "name":
+            key = np.array([meta[r]["name"].lower() for r in rows], dtype=object)
+            ranked = rows[np.argsort(key, kind="stable")]
+            if order == "desc":
+                ranked = ranked[::-1]
+        else:
+            key = ind[sort][rows]
+            # Missing values sort last either way
+            key = np.where(np.isnan(key), np.inf if order == "asc" else -np.inf, key)
+            ranked = rows[np.argsort(key if order == "asc" else -key, kind="stable")]
+        page_rows = ranked[(page - 1) * page_size:page * page_size]
+
+        def number(value):
+            return float(value) if np.isfinite(value) else None
+
+        items = []
+        for r in page_rows.tolist():
+            mode = int(ind["mode"][r])
+            items.append({
+                "id": ids[r],
+                **meta[r],
+                "health": round(float(ind["health"][r]), 1),
+                "risk": RISK_LEVELS[ind["risk"][r]],
+                "failure_mode": FAILURE_MODES[SIGNALS[mode]] if mode >= 0 else "Normal",
+                "days_to_action": number(ind["days_to_action"][r]),
+                "fouling_level": number(ind["fouling_level"][r]),
+                "fouling_slope": number(ind["fouling_slope"][r]),
+                "dp_drift": number(ind["dp_drift"][r]),
+                "load_factor": number(ind["load_factor"][r]),
+                "last_t": number(last_t[r]),
+            })
+        counts = np.bincount(ind["risk"], minlength=len(RISK_LEVELS))
+        return {
+            "total": int(len(rows)),
+            "page": page,
+            "page_size": page_size,
+            "items": items,
+            "summary": {
+                "assets": int(len(ids)),
+                "mean_health": float(ind["health"].mean()) if len(ids) else None,
+                "by_risk": dict(zip(RISK_LEVELS, counts.tolist())),
+                "due_30_days": int((ind["days_to_action"] <= 30).sum()),
+                "fouling_history": [{"t": t, "fouling": v} for t, v in history],
+            },
+        }
@@ -0,0 +1,136 @@
+"""LRU result cache keyed by canonicalized request parameters."""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+
+# Rounding step per payload field, matching what the plant instruments resolve.
+# Fields not listed keep 6 significant digits.
+INSTRUMENT_PRECISION = {
+    "spec_bsw": 0.001, "spec_salt": 0.01,
+    "flow_min": 10.0, "flow_max": 10.0, "baseline_flow": 10.0, "flow": 10.0,
+    "T_min": 0.1, "T_max": 0.1, "baseline_temp": 0.1, "T": 0.1, "temp": 0.1,
+    "V_min": 0.1, "V_max": 0.1, "baseline_voltage": 0.1, "V": 0.1, "voltage": 0.1,
+    "ppm_min": 0.1, "ppm_max": 0.1, "baseline_demulsifier": 0.1, "ppm": 0.1,
+    "wash_min": 0.01, "wash_max": 0.01, "baseline_wash": 0.01, "wash": 0.01,
+}
+ENTRY_OVERHEAD = 256  # bytes of bookkeeping charged per entry on top of its payload
+
+
+def _round(value: float, field: str) -> float:
+    """Round ``value`` to the instrument precision of ``field``."""
+    if not math.isfinite(value):
+        return value
+    step = INSTRUMENT_PRECISION.get(field)
+    if step is not None:
+        return round(round(value / step) * step, 10)
+    return float(f"{value:.6g}")
+
+
+def canonicalize(value, field: str = ""):
+    """Return ``value`` with numbers as rounded floats and dicts key-sorted, ready for hashing.
+
+    Ints become floats so ``20000`` and ``20000.0`` share a key. Ints outside
+    ``INSTRUMENT_PRECISION`` (counts, seeds) are converted exactly rather
+    than cut to 6 digits, so distinct seeds never collide.
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        if field in INSTRUMENT_PRECISION:
+            return _round(float(value), field)
+        return float(value) if abs(value) <= 2 ** 53 else value
+    if isinstance(value, float):
+        return _round(value, field)
+    if isinstance(value, dict):
+        return {k: canonicalize(v, k) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v, field) for v in value]
+    return str(value)
+
+
+def canonical_key(namespace: str, params: dict) -> str:
+    """Return a stable cache key for ``params`` under ``namespace``."""
+    blob = json.dumps(canonicalize(params), separators=(",", ":"), allow_nan=True)
+    return f"{namespace}:{hashlib.sha256(blob.encode()).hexdigest()}"
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a byte budget and per-entry TTL.
+
+    Values are ``(payload, extra)`` pairs where ``payload`` is ``bytes``; the
+    byte budget is charged ``len(payload)`` plus a fixed per-entry overhead.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, size, payload, extra)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str):
+        """Return ``(payload, extra)`` for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put(self, key: str, payload: bytes, extra=None, ttl: float = None):
+        """Store ``payload`` under ``key``, evicting least recently used entries to fit."""
+        size = len(payload) + len(key) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, size, payload, extra)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return occupancy and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _drop(self, key: str):
+        """Remove ``key``; caller holds the lock."""
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
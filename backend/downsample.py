@@ -0,0 +1,113 @@
+"""Downsampling of time series for charting.
+
+``minmax`` keeps the smallest and largest value of each bucket, so spikes
+survive. ``lttb`` is Largest-Triangle-Three-Buckets: one point per bucket,
+chosen to maximise the triangle it forms with the previous pick and the
+next bucket's mean. ``downsample`` runs either over a list of array parts
+(such as the per-chunk views of the archive) without concatenating them:
+each part is first reduced with min/max preselection to a few points per
+output bucket, then the chosen method runs on that small set (the
+MinMaxLTTB scheme).
+"""
+
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+PRESELECT_RATIO = 4  # min/max candidates kept per output point before LTTB
+
+
+def minmax_indices(v: np.ndarray, n_out: int) -> np.ndarray:
+    """Return sorted indices of the min and max of ``n_out // 2`` equal-count buckets of ``v``."""
+    n = len(v)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    full = n // size
+    block = v[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    picks = [block.argmin(axis=1) + offsets, block.argmax(axis=1) + offsets]
+    if full * size < n:
+        tail = v[full * size:]
+        picks.append(np.array([tail.argmin(), tail.argmax()]) + full * size)
+    return np.unique(np.concatenate(picks))
+
+
+def minmax(t: np.ndarray, v: np.ndarray, n_out: int):
+    """Reduce ``(t, v)`` to at most about ``n_out`` points, keeping each bucket's extremes."""
+    keep = minmax_indices(v, n_out)
+    return t[keep], v[keep]
+
+
+def lttb(t: np.ndarray, v: np.ndarray, n_out: int):
+    """Reduce ``(t, v)`` to ``n_out >= 3`` points with Largest-Triangle-Three-Buckets."""
+    n = len(t)
+    if n <= n_out:
+        return t, v
+    t = np.asarray(t, dtype=np.float64)
+    w = np.asarray(v, dtype=np.float64)
+    # Buckets over the interior points; first and last points are always kept
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    # Mean of every bucket, plus the last point as the "next bucket" of the final one
+    mean_t = np.append(np.add.reduceat(t[1:n - 1], edges[:-1] - 1) / counts, t[-1])
+    mean_v = np.append(np.add.reduceat(w[1:n - 1], edges[:-1] - 1) / counts, w[-1])
+
+    picks = np.empty(n_out, dtype=np.int64)
+    picks[0], picks[-1] = 0, n - 1
+    ta, va = t[0], w[0]
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bt, bv = t[lo:hi], w[lo:hi]
+        area = np.abs((ta - mean_t[i + 1]) * (bv - va) - (ta - bt) * (mean_v[i + 1] - va))
+        j = lo + int(area.argmax())
+        picks[i + 1] = j
+        ta, va = t[j], w[j]
+    return t[picks], v[picks]
+
+
+def tail(parts: list, limit: int) -> list:
+    """Trim ``(t, v)`` parts to their last ``limit`` points in total."""
+    out = []
+    for t, v in reversed(parts):
+        if limit <= 0:
+            break
+        if len(t) > limit:
+            t, v = t[len(t) - limit:], v[len(v) - limit:]
+        out.append((t, v))
+        limit -= len(t)
+    return out[::-1]
+
+
+def concat(parts: list):
+    """Join ``(t, v)`` parts, avoiding a copy for a single part."""
+    if not parts:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float32)
+    if len(parts) == 1:
+        return parts[0]
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def downsample(parts: list, n_out: int, method: str = "lttb"):
+    """Downsample consecutive ``(t, v)`` parts to about ``n_out`` points with ``method``."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}")
+    if n_out < 3:
+        raise ValueError("points must be at least 3")
+    total = sum(len(t) for t, _ in parts)
+    if total <= n_out:
+        return concat(parts)
+    budget = n_out * (PRESELECT_RATIO if method == "lttb" else 1)
+    if len(parts) > 1 or (method == "lttb" and total > budget):
+        # Min/max preselection per part, in proportion to its length
+        reduced = []
+        for t, v in parts:
+            keep = minmax_indices(v, max(2, int(np.ceil(len(t) / total * budget))))
+            reduced.append((t[keep], v[keep]))
+        t, v = concat(reduced)
+    else:
+        t, v = parts[0]
+    if method == "lttb":
+        return lttb(t, v, n_out)
+    return minmax(t, v, n_out)
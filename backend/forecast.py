@@ -0,0 +1,173 @@
+"""Incremental Holt-Winters forecasts of tag values.
+
+Samples are averaged into hourly buckets. The first day of buckets sets
+the level and the 24-bucket daily season; every later bucket updates a
+damped-trend additive Holt-Winters state (level, trend and season) and an
+EWMA of the squared one-step errors. A forecast reads only that state, so
+it costs ``O(horizon)`` whatever the length of the history, and bands use
+the standard Holt-Winters error variance ``sigma^2 * (1 + sum c_j^2)``.
+"""
+
+import threading
+
+import numpy as np
+
+from .historian import advancing
+
+BUCKET_SECONDS = 3600.0
+SEASON = 24             # buckets per season (one day of hourly buckets)
+ALPHA = 0.3             # level smoothing
+BETA = 0.02             # trend smoothing
+GAMMA = 0.1             # seasonal smoothing
+PHI = 0.9               # trend damping per bucket
+ERROR_ALPHA = 0.05      # EWMA weight of each squared one-step error
+MAX_GAP = 7 * SEASON    # buckets without data after which the state restarts
+MAX_HORIZON = 7 * SEASON
+Z_95 = 1.959964
+
+
+class TagForecaster:
+    """Bucket accumulator and Holt-Winters state of one tag."""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.bucket = None        # id of the open bucket
+        self.bucket_sum = 0.0
+        self.bucket_count = 0
+        self.last_t = -np.inf
+        self.level = None
+        self.trend = 0.0
+        self.season = np.zeros(SEASON)
+        self.sigma2 = None
+        self.last_bucket = None   # id of the newest closed bucket
+        self.last_value = None
+        self.buckets = 0
+        self._first = []          # (bucket, mean) until the first season is complete
+        self._cached = None       # (buckets, horizon, forecast)
+        self._lock = threading.Lock()
+
+    def update(self, t, v):
+        """Fold in samples later than the previous one; closes every bucket they move past."""
+        if len(t) == 1:
+            self._update_one(float(t[0]), float(v[0]))
+            return
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        with self._lock:
+            keep = advancing(t, self.last_t) & np.isfinite(v)
+            if not keep.all():
+                t, v = t[keep], v[keep]
+            if len(t) == 0:
+                return
+            ids = np.floor(t / BUCKET_SECONDS).astype(np.int64)
+            starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+            sums = np.add.reduceat(v, starts).tolist()
+            counts = np.diff(np.r_[starts, len(ids)]).tolist()
+            for bucket, total, count in zip(ids[starts].tolist(), sums, counts):
+                self._accumulate(bucket, total, count)
+            self.last_t = float(t[-1])
+
+    def _update_one(self, t: float, v: float):
+        with self._lock:
+            if not t > self.last_t or not np.isfinite(t) or not np.isfinite(v):
+                return
+            self._accumulate(int(t // BUCKET_SECONDS), v, 1)
+            self.last_t = t
+
+    def _accumulate(self, bucket: int, total: float, count: int):
+        if bucket != self.bucket:
+            if self.bucket_count:
+                self._close(self.bucket, self.bucket_sum / self.bucket_count)
+            self.bucket, self.bucket_sum, self.bucket_count = bucket, 0.0, 0
+        self.bucket_sum += total
+        self.bucket_count += count
+
+    def _close(self, bucket: int, y: float):
+        """Holt-Winters update with the mean ``y`` of closed ``bucket``."""
+        gap = bucket - self.last_bucket if self.last_bucket is not None else None
+        if gap is not None and gap > MAX_GAP:
+            self._first = []
+        if gap is None or gap > MAX_GAP or len(self._first) < SEASON:
+            self._start(bucket, y)
+        else:
+            # Buckets without samples advance the state with its own forecast
+            for _ in range(gap - 1):
+                self.level += PHI * self.trend
+                self.trend *= PHI
+            slot = bucket % SEASON
+            predicted = self.level + PHI * self.trend + self.season[slot]
+            error = y - predicted
+            self.sigma2 = error ** 2 if self.sigma2 is None else \
+                (1.0 - ERROR_ALPHA) * self.sigma2 + ERROR_ALPHA * error ** 2
+            level = ALPHA * (y - self.season[slot]) + (1.0 - ALPHA) * (self.level + PHI * self.trend)
+            self.trend = BETA * (level - self.level) + (1.0 - BETA) * PHI * self.trend
+            self.season[slot] = GAMMA * (y - level) + (1.0 - GAMMA) * self.season[slot]
+            self.level = level
+        self.last_bucket, self.last_value = bucket, y
+        self.buckets += 1
+
+    def _start(self, bucket: int, y: float):
+        """Collect the first season; once complete, level is its mean and season the offsets from it."""
+        if self._first and bucket - self._first[0][0] >= SEASON:
+            self._first = [(b, v) for b, v in self._first if bucket - b < SEASON]
+        self._first.append((bucket, y))
+        values = np.array([v for _, v in self._first])
+        self.level, self.trend = float(values.mean()), 0.0
+        self.sigma2 = float(values.var()) if len(values) > 1 else None
+        self.season[:] = 0.0
+        if len(self._first) == SEASON:
+            for b, v in self._first:
+                self.season[b % SEASON] = v - self.level
+
+    def forecast(self, horizon: int) -> dict:
+        """Return the next ``horizon`` hourly bucket means with 95% bands, or ``None`` before the first bucket closes."""
+        with self._lock:
+            if self.last_bucket is None:
+                return None
+            if self._cached is not None and self._cached[:2] == (self.buckets, horizon):
+                return self._cached[2]
+            h = np.arange(1, horizon + 1)
+            damped = np.cumsum(PHI ** h)
+            value = self.level + damped * self.trend + self.season[(self.last_bucket + h) % SEASON]
+            # c_j for j = 1 .. horizon - 1; step h sums the first h - 1 of them
+            c = ALPHA * (1.0 + BETA * damped[:-1]) + GAMMA * (h[:-1] % SEASON == 0)
+            sigma2 = self.sigma2 or 0.0
+            spread = Z_95 * np.sqrt(sigma2 * (1.0 + np.r_[0.0, np.cumsum(c ** 2)]))
+            result = {
+                "tag": self.tag,
+                "bucket_seconds": BUCKET_SECONDS,
+                "buckets": self.buckets,
+                "last": {"t": self.last_bucket * BUCKET_SECONDS, "value": self.last_value},
+                "t": ((self.last_bucket + h) * BUCKET_SECONDS).tolist(),
+                "value": value.tolist(),
+                "lower": (value - spread).tolist(),
+                "upper": (value + spread).tolist(),
+                "sigma": float(np.sqrt(sigma2)),
+                "level": self.level,
+                "trend": self.trend,
+            }
+            self._cached = (self.buckets, horizon, result)
+            return result
+
+
+class Forecaster:
+    """Per-tag forecasters, created on a tag's first sample."""
+
+    def __init__(self):
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def update(self, tag: str, t, v):
+        with self._lock:
+            forecaster = self._tags.get(tag)
+            if forecaster is None:
+                forecaster = self._tags[tag] = TagForecaster(tag)
+        forecaster.update(t, v)
+
+    def forecast(self, tag: str, horizon: int = SEASON) -> dict:
+        """Forecast ``tag``; raises ``KeyError`` for an unknown tag and ``ValueError`` for a bad horizon."""
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+        with self._lock:
+            forecaster = self._tags[tag]
+        return forecaster.forecast(horizon)
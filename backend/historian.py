@@ -0,0 +1,149 @@
+"""In-memory process historian: one fixed-capacity ring buffer per tag.
+
+Each tag keeps parallel NumPy arrays of timestamps (float64 Unix seconds)
+and values (float32). Timestamps must increase strictly, so both halves of
+the ring are sorted and range queries are two binary searches.
+"""
+
+import re
+import threading
+
+import numpy as np
+
+# Tags shown in the Monitoring panel of result.html
+MONITORED_TAGS = ("flow", "bsw", "salt", "temp", "voltage", "ppm", "wash", "energy")
+TAG_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+DEFAULT_CAPACITY = 1 << 20  # ~12 MB per tag
+
+
+def advancing(t: np.ndarray, last_t: float) -> np.ndarray:
+    """Mask of the finite timestamps in ``t`` later than ``last_t`` and every kept one before them.
+
+    Non-finite timestamps are rejected and left out of the running maximum,
+    so a NaN in a batch does not reject the samples after it.
+    """
+    finite = np.isfinite(t)
+    earlier = np.where(finite, t, -np.inf)[:-1]
+    return finite & (t > np.maximum.accumulate(np.concatenate([[last_t], earlier])))
+
+
+class TagBuffer:
+    """Ring buffer of ``(timestamp, value)`` samples for one tag."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.t = np.empty(capacity, dtype=np.float64)
+        self.v = np.empty(capacity, dtype=np.float32)
+        self.head = 0       # next write position
+        self.size = 0
+        self.last_t = -np.inf
+        self.rejected = 0   # samples dropped for not advancing the clock
+        self._lock = threading.Lock()
+
+    def append(self, t: np.ndarray, v: np.ndarray) -> int:
+        """Append samples, dropping any not later than the previous one; returns how many were kept."""
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float32)
+        with self._lock:
+            if len(t):
+                keep = advancing(t, self.last_t)
+                if not keep.all():
+                    self.rejected += int(len(t) - keep.sum())
+                    t, v = t[keep], v[keep]
+            n = len(t)
+            if n == 0:
+                return 0
+            self.last_t = float(t[-1])
+            if n > self.capacity:
+                t, v = t[-self.capacity:], v[-self.capacity:]
+            m = len(t)
+            first = min(m, self.capacity - self.head)
+            self.t[self.head:self.head + first] = t[:first]
+            self.v[self.head:self.head + first] = v[:first]
+            if first < m:
+                self.t[:m - first] = t[first:]
+                self.v[:m - first] = v[first:]
+            self.head = (self.head + m) % self.capacity
+            self.size = min(self.size + m, self.capacity)
+            return n
+
+    def _segments(self):
+        """Return the stored samples as up to two ``(t, v)`` views, oldest first; caller holds the lock."""
+        if self.size < self.capacity:
+            return [(self.t[:self.size], self.v[:self.size])]
+        return [(self.t[self.head:], self.v[self.head:]), (self.t[:self.head], self.v[:self.head])]
+
+    def range(self, start: float = None, end: float = None):
+        """Return copies of the timestamps and values with ``start <= t <= end``."""
+        with self._lock:
+            ts, vs = [], []
+            for t, v in self._segments():
+                lo = 0 if start is None else np.searchsorted(t, start, side="left")
+                hi = len(t) if end is None else np.searchsorted(t, end, side="right")
+                if hi > lo:
+                    ts.append(t[lo:hi])
+                    vs.append(v[lo:hi])
+            if not ts:
+                return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float32)
+            return np.concatenate(ts), np.concatenate(vs)
+
+    def latest(self):
+        """Return the newest ``(timestamp, value)``, or ``None`` when empty."""
+        with self._lock:
+            if self.size == 0:
+                return None
+            i = (self.head - 1) % self.capacity
+            return float(self.t[i]), float(self.v[i])
+
+    def info(self) -> dict:
+        with self._lock:
+            first = self._segments()[0][0]
+            return {
+                "count": self.size,
+                "capacity": self.capacity,
+                "first": float(first[0]) if self.size else None,
+                "last": self.last_t if self.size else None,
+                "rejected": self.rejected,
+                "bytes": self.t.nbytes + self.v.nbytes,
+            }
+
+
+class Historian:
+    """Ring buffers by tag name, created on first write up to ``max_tags``."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_tags: int = 64):
+        self.capacity = capacity
+        self.max_tags = max_tags
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def buffer(self, tag: str, create: bool = False):
+        """Return the buffer for ``tag``; with ``create`` make it if missing."""
+        with self._lock:
+            buf = self._tags.get(tag)
+            if buf is None and create:
+                if not TAG_PATTERN.match(tag):
+                    raise ValueError(f"Invalid tag name: {tag!r}")
+                if len(self._tags) >= self.max_tags:
+                    raise ValueError(f"Historian is limited to {self.max_tags} tags")
+                buf = self._tags[tag] = TagBuffer(self.capacity)
+            return buf
+
+    def append(self, tag: str, t, v) -> int:
+        """Append samples for ``tag``; ``t`` and ``v`` must have the same length."""
+        if len(t) != len(v):
+            raise ValueError(f"Tag {tag!r}: {len(t)} timestamps but {len(v)} values")
+        return self.buffer(tag, create=True).append(t, v)
+
+    def range(self, tag: str, start: float = None, end: float = None):
+        """Return ``(t, v)`` arrays for ``tag`` between ``start`` and ``end``; raises ``KeyError`` if unknown."""
+        buf = self.buffer(tag)
+        if buf is None:
+            raise KeyError(tag)
+        return buf.range(start, end)
+
+    def tags(self) -> dict:
+        """Return per-tag occupancy, keyed by tag name."""
+        with self._lock:
+            buffers = dict(self._tags)
+        return {tag: buf.info() for tag, buf in sorted(buffers.items())}
@@ -0,0 +1,249 @@
+"""Streaming import of historian CSV exports.
+
+Two layouts are recognised from the header row:
+
+* wide: a timestamp column plus one column per tag
+  (``timestamp,flow,bsw,salt,...``);
+* long: ``timestamp,tag,value`` columns, one sample per row.
+
+The timestamp column is the one named ``timestamp``, ``time``, ``datetime``
+or ``date`` (otherwise the first column) and holds Unix seconds or ISO 8601
+UTC times. Fields are split on commas without quote handling, which is
+what historian exports of numeric tags look like.
+
+Input is consumed in blocks of about ``block_bytes``; each block is split
+into one flat field array and its columns are converted with NumPy, so
+memory stays bounded by the block size whatever the file size. Blocks
+whose bytes are all numeric and whose rows all have the header's field
+count are parsed in a single ``numpy.fromstring`` pass; others (ISO
+timestamps, empty fields, tag names, ragged rows) go through a flat string
+array, which skips the ragged rows.
+
+Run as ``python -m backend.importer FILE...`` to load files straight into
+the on-disk archive.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+TIME_COLUMNS = ("timestamp", "time", "datetime", "date")
+DEFAULT_BLOCK_BYTES = 8 * 1024 * 1024
+# Every byte an all-numeric block may hold: digits, signs, exponents, nan/inf, separators
+NUMERIC_BYTES = b"0123456789+-.eEnaifNAIFty,\n \t"
+
+
+def parse_timestamps(column: np.ndarray) -> np.ndarray:
+    """Convert a string array of Unix seconds or ISO 8601 UTC times to float64 seconds."""
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        pass
+    stamps = np.char.rstrip(np.char.strip(column), "Z").astype("datetime64[us]")
+    return stamps.astype(np.int64) / 1e6
+
+
+def field_counts(lines: list) -> np.ndarray:
+    """Number of comma-separated fields on each of ``lines``, counted in one vectorized pass."""
+    raw = np.frombuffer(("\n" + "\n".join(lines) + "\n").encode(), dtype=np.uint8)
+    commas = np.flatnonzero(raw == ord(","))
+    return np.diff(np.searchsorted(commas, np.flatnonzero(raw == ord("\n")))) + 1
+
+
+def parse_numeric(lines: list, ncols: int):
+    """Parse all-numeric rows in one C-level pass; ``None`` if any field is empty, text or missing.
+
+    The block is checked before parsing: only numeric bytes, no empty
+    fields and exactly ``ncols`` fields on every row, so a short row and a
+    long row cannot cancel out and shift values into the wrong columns.
+    """
+    data = "\n".join(lines).encode()
+    if data.translate(None, NUMERIC_BYTES):
+        return None
+    packed = b"\n" + data.translate(None, b" \t") + b"\n"
+    if b",," in packed or b"\n," in packed or b",\n" in packed:
+        return None
+    if np.any(field_counts(lines) != ncols):
+        return None
+    try:
+        flat = np.fromstring(",".join(lines), sep=",")
+    except ValueError:
+        return None
+    if flat.size != len(lines) * ncols:
+        return None
+    return flat.reshape(len(lines), ncols)
+
+
+def parse_values(column: np.ndarray) -> np.ndarray:
+    """Convert a string array to float64, mapping empty fields to NaN."""
+    column = np.char.strip(column)
+    return np.where(column == "", "nan", column).astype(np.float64)
+
+
+class CsvImporter:
+    """Incremental CSV parser that hands each tag's samples to ``sink(tag, t, v)``.
+
+    Call ``feed`` with raw bytes as they arrive and ``close`` at the end.
+    Rows with the wrong number of fields are skipped and counted. ``sink``
+    returns how many samples it kept (or a tuple of counts, one per store);
+    samples no store kept, such as a re-import of data already stored, are
+    counted as rejected.
+    """
+
+    def __init__(self, sink, block_bytes: int = DEFAULT_BLOCK_BYTES, total_bytes: int = None):
+        self.sink = sink
+        self.block_bytes = block_bytes
+        self.total_bytes = total_bytes
+        self.columns = None
+        self.time_col = 0
+        self.long_format = False
+        self.bytes_read = 0
+        self.rows = 0
+        self.bad_rows = 0
+        self.samples = {}
+        self.rejected = {}
+        self.started = time.perf_counter()
+        self.finished = None
+        self._pending = []
+        self._pending_bytes = 0
+
+    def feed(self, data: bytes):
+        """Buffer ``data`` and parse every complete block of lines."""
+        self.bytes_read += len(data)
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        if self._pending_bytes >= self.block_bytes:
+            buf = b"".join(self._pending)
+            cut = buf.rfind(b"\n") + 1
+            self._pending = [buf[cut:]]
+            self._pending_bytes = len(buf) - cut
+            if cut:
+                self._parse(buf[:cut])
+
+    def close(self) -> dict:
+        """Parse what is left and return the final ``progress()``."""
+        buf = b"".join(self._pending)
+        self._pending, self._pending_bytes = [], 0
+        if buf.strip():
+            self._parse(buf)
+        self.finished = time.perf_counter()
+        return self.progress()
+
+    def progress(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            "rows": self.rows,
+            "bad_rows": self.bad_rows,
+            "bytes": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "fraction": self.bytes_read / self.total_bytes if self.total_bytes else None,
+            "elapsed_s": elapsed,
+            "rows_per_s": self.rows / elapsed if elapsed > 0 else 0.0,
+            "samples": dict(self.samples),
+            "rejected_samples": dict(self.rejected),
+            "done": self.finished is not None,
+        }
+
+    def _header(self, line: str):
+        self.columns = [c.strip() for c in line.split(",")]
+        lowered = [c.lower() for c in self.columns]
+        self.time_col = next((lowered.index(c) for c in TIME_COLUMNS if c in lowered), 0)
+        self.long_format = "tag" in lowered and "value" in lowered
+        if self.long_format:
+            self.tag_col, self.value_col = lowered.index("tag"), lowered.index("value")
+
+    def _parse(self, block: bytes):
+        text = block.decode("utf-8-sig" if self.columns is None else "utf-8")
+        lines = text.replace("\r", "").split("\n")
+        if self.columns is None:
+            while lines and not lines[0].strip():
+                lines.pop(0)
+            if not lines:
+                return
+            self._header(lines.pop(0))
+        lines = [line for line in lines if line]
+        if not lines:
+            return
+
+        ncols = len(self.columns)
+        if not self.long_format:
+            numeric = parse_numeric(lines, ncols)
+            if numeric is not None:
+                self.rows += len(lines)
+                t = numeric[:, self.time_col]
+                for col, tag in enumerate(self.columns):
+                    if col != self.time_col and tag:
+                        self._emit(tag, t, numeric[:, col])
+                return
+
+        counts = field_counts(lines)
+        if np.any(counts != ncols):
+            good = [line for line, n in zip(lines, counts.tolist()) if n == ncols]
+            self.bad_rows += len(lines) - len(good)
+            lines = good
+        if not lines:
+            return
+        fields = ",".join(lines).split(",")
+        table = np.array(fields).reshape(len(lines), ncols)
+        self.rows += len(lines)
+
+        t = parse_timestamps(table[:, self.time_col])
+        if self.long_format:
+            tags = np.char.strip(table[:, self.tag_col])
+            values = parse_values(table[:, self.value_col])
+            names, inverse = np.unique(tags, return_inverse=True)
+            for i, tag in enumerate(names.tolist()):
+                mask = inverse == i
+                self._emit(tag, t[mask], values[mask])
+        else:
+            for col, tag in enumerate(self.columns):
+                if col != self.time_col and tag:
+                    self._emit(tag, t, parse_values(table[:, col]))
+
+    def _emit(self, tag: str, t: np.ndarray, v: np.ndarray):
+        present = ~np.isnan(v)
+        if not present.all():
+            t, v = t[present], v[present]
+        if len(t):
+            kept = self.sink(tag, t, v)
+            kept = max(kept) if isinstance(kept, tuple) else int(kept)
+            self.samples[tag] = self.samples.get(tag, 0) + kept
+            if kept < len(t):
+                self.rejected[tag] = self.rejected.get(tag, 0) + len(t) - kept
+
+
+def main(argv=None):
+    from .archive import Archive
+
+    parser = argparse.ArgumentParser(description="Import historian CSV exports into the tag archive.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--archive-dir", default="desalter_data/archive")
+    parser.add_argument("--block-mb", type=float, default=DEFAULT_BLOCK_BYTES / 2**20)
+    args = parser.parse_args(argv)
+
+    archive = Archive(args.archive_dir)
+    for name in args.files:
+        with open(name, "rb") as f:
+            f.seek(0, 2)
+            importer = CsvImporter(archive.append, int(args.block_mb * 2**20), total_bytes=f.tell())
+            f.seek(0)
+            while True:
+                data = f.read(importer.block_bytes)
+                if not data:
+                    break
+                importer.feed(data)
+                p = importer.progress()
+                print(f"\r{name}: {p['fraction']:6.1%}  {p['rows']:,} rows  {p['rows_per_s']:,.0f} rows/s",
+                      end="", file=sys.stderr)
+            p = importer.close()
+        rejected = sum(p["rejected_samples"].values())
+        print(f"\r{name}: {p['rows']:,} rows ({p['bad_rows']:,} skipped, {rejected:,} samples not newer "
+              f"than the archive) in {p['elapsed_s']:.1f} s, "
+              f"{p['rows_per_s']:,.0f} rows/s", file=sys.stderr)
+    archive.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Background optimization jobs on a bounded process pool.
+
+CPU-bound work runs in worker processes so the event loop keeps serving
+``/api/ping`` and static assets. Workers report progress through a shared
+queue that a drain thread applies to the ``Job`` records, and check a
+shared per-slot flag so running jobs can be cancelled cooperatively.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .optimizer import OptimizationProblem, ResponseModel, optimize_local, optimize_sampling
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    """Raised when the number of queued and running jobs is at the configured depth."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+@dataclass
+class Job:
+    """State of one background job; ``version`` bumps on every change."""
+
+    id: str
+    kind: str
+    status: str = "queued"
+    phase: str = "queued"
+    evaluated: int = 0
+    total: int = 0
+    best_objective: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    version: int = 0
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED
+
+    def update(self, **changes):
+        """Apply ``changes`` and bump ``version``; ``JobManager`` calls it under its lock."""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.version += 1
+
+    def snapshot(self, include_result: bool = True) -> dict:
+        """Return a JSON-ready view of the job."""
+        snap = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "phase": self.phase,
+            "evaluated": self.evaluated,
+            "total": self.total,
+            "best_objective": self.best_objective,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if self.error is not None:
+            snap["error"] = self.error
+        if include_result and self.result is not None:
+            snap["result"] = self.result
+        return snap
+
+
+def run_optimization(inputs: dict, model: ResponseModel, progress) -> dict:
+    """Run the optimizer selected by ``inputs["engine"]`` on ``model``, reporting through ``progress``."""
+    progress("validating", 0, 0, None)
+    problem = OptimizationProblem.from_inputs(inputs, model)
+    if inputs.get("engine") == "local":
+        # Already inside a pool worker: run the starts here rather than in a nested pool
+        return optimize_local(problem, inputs.get("n_starts", 8), parallel=False, progress=progress)
+    return optimize_sampling(problem, inputs.get("n_samples", 3000), seed=inputs.get("seed"),
+                             progress=progress)
+
+
+# Set in each worker process by _init_worker
+_progress_queue = None
+_cancel_flags = None
+
+
+def _init_worker(progress_queue, cancel_flags):
+    """Process-pool initializer: keep the shared queue and cancel flags."""
+    global _progress_queue, _cancel_flags
+    _progress_queue, _cancel_flags = progress_queue, cancel_flags
+
+
+def _execute(job_id: str, slot: int, fn, args):
+    """Worker entry point: run ``fn(*args, progress)`` for one job."""
+    def progress(phase, evaluated, total, best_objective):
+        if _cancel_flags[slot]:
+            raise JobCancelled()
+        _progress_queue.put((job_id, phase, evaluated, total, best_objective))
+
+    progress("starting", 0, 0, None)
+    return fn(*args, progress)
+
+
+class JobManager:
+    """Submits jobs to a process pool of ``max_workers``.
+
+    At most ``max_queue`` jobs may be queued or running at once; finished
+    jobs are kept for ``retention`` seconds. The pool starts on first use.
+    """
+
+    def __init__(self, max_workers: int = None, max_queue: int = 16, retention: float = 600.0):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retention = retention
+        self._jobs = {}
+        self._futures = {}
+        self._slots = {}
+        self._free_slots = list(range(max_queue))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._queue = None
+        self._flags = None
+        self._drain_thread = None
+
+    def _start(self):
+        """Create the pool, shared queue/flags and drain thread; caller holds the lock."""
+        ctx = multiprocessing.get_context("spawn")
+        self._queue = ctx.Queue()
+        self._flags = ctx.RawArray("b", self.max_queue)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(self._queue, self._flags),
+        )
+        self._drain_thread = threading.Thread(target=self._drain, name="job-progress", daemon=True)
+        self._drain_thread.start()
+
+    def _restart(self):
+        """Replace a broken pool (a worker died) with a fresh one; caller holds the lock.
+
+        Jobs still outstanding on the old pool are marked failed; their
+        futures fail too, and ``_finish`` then releases the slots.
+        """
+        for job_id in list(self._futures):
+            job = self._jobs.get(job_id)
+            if job is not None and not job.is_finished:
+                job.update(status="failed", phase="failed", error="worker process died", finished=time.time())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._queue.put(None)
+        self._start()
+
+    def submit(self, kind: str, fn, *args, on_done=None) -> Job:
+        """Queue ``fn(*args, progress)`` and return its job; ``on_done(result)`` runs after success.
+
+        ``fn`` and ``args`` must be picklable. Raises ``QueueFull`` at capacity.
+        """
+        with self._lock:
+            self._purge()
+            if not self._free_slots:
+                raise QueueFull(f"{self.max_queue} jobs already queued or running")
+            if self._executor is None:
+                self._start()
+            job = Job(id=uuid.uuid4().hex, kind=kind)
+            slot = self._free_slots.pop()
+            self._flags[slot] = 0
+            self._jobs[job.id] = job
+            self._slots[job.id] = slot
+            try:
+                future = self._executor.submit(_execute, job.id, slot, fn, args)
+            except BrokenProcessPool:
+                self._restart()
+                future = self._executor.submit(_execute, job.id, slot, fn, args)
+            self._futures[job.id] = future
+        future.add_done_callback(lambda f: self._finish(job, f, on_done))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id)
+
+    def list(self) -> list:
+        """Return snapshots (without results) of every retained job, newest first."""
+        with self._lock:
+            self._purge()
+            jobs = sorted(self._jobs.values(), key=lambda j: j.created, reverse=True)
+        return [j.snapshot(include_result=False) for j in jobs]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns whether it was still active."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+            self._flags[self._slots[job_id]] = 1
+            future = self._futures[job_id]
+        # A job that never started is dropped by the pool; a running one stops at its next progress call
+        future.cancel()
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            by_status = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "retention_seconds": self.retention,
+            "by_status": by_status,
+        }
+
+    def shutdown(self):
+        """Stop the pool, cancelling jobs that have not started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._queue.put(None)
+
+    def _finish(self, job: Job, future, on_done):
+        """Record the outcome of ``future`` on ``job`` and release its slot.
+
+        On success ``on_done`` runs before the job is marked done, so a
+        client that sees the ``done`` status also finds what it stored.
+        """
+        succeeded = not future.cancelled() and future.exception() is None
+        try:
+            if succeeded and on_done:
+                on_done(future.result())
+        finally:
+            with self._lock:
+                # A job already failed by _restart keeps that outcome
+                if not job.is_finished:
+                    if future.cancelled():
+                        job.update(status="cancelled", phase="cancelled", finished=time.time())
+                    elif isinstance(future.exception(), JobCancelled):
+                        job.update(status="cancelled", phase="cancelled", finished=time.time())
+                    elif future.exception() is not None:
+                        job.update(status="failed", phase="failed", error=str(future.exception()),
+                                   finished=time.time())
+                    else:
+                        job.update(status="done", phase="done", result=future.result(), finished=time.time())
+                self._futures.pop(job.id, None)
+                self._free_slots.append(self._slots.pop(job.id))
+
+    def _drain(self):
+        """Apply progress messages from the workers to their jobs."""
+        while True:
+            try:
+                message = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if message is None:
+                return
+            job_id, phase, evaluated, total, best_objective = message
+            # Check and update under one lock so a late message cannot reopen a finished job
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.is_finished:
+                    continue
+                changes = {"phase": phase, "evaluated": evaluated, "total": total, "best_objective": best_objective}
+                if job.status == "queued":
+                    changes.update(status="running", started=time.time())
+                job.update(**changes)
+
+    def _purge(self):
+        """Drop finished jobs past retention; caller holds the lock."""
+        cutoff = time.time() - self.retention
+        for job_id in [j.id for j in self._jobs.values() if j.is_finished and j.finished < cutoff]:
+            del self._jobs[job_id]
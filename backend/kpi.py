@@ -0,0 +1,230 @@
+"""Rolling-window KPI aggregates updated as samples arrive.
+
+Each window (1 min, 1 h, 24 h) is a ring of ``BUCKETS`` time buckets
+holding the sum, count, min and max of the samples that fell in them, plus
+the seconds covered and the seconds "running" for uptime. A batch of
+samples is folded in with a few ``reduceat`` calls, and reading a window
+combines its buckets, so neither depends on how much history has been
+seen. Windows slide one bucket at a time and end at the current time.
+
+Uptime is weighted by time: every sample's running state holds until the
+next sample, and the newest one's until the window closes, so a tag that
+stops reporting keeps its last state rather than freezing the fraction.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .historian import advancing
+
+WINDOWS = {"1m": 60.0, "1h": 3600.0, "24h": 86400.0}
+BUCKETS = 60
+# A tag counts as running (for uptime) while its value is above this
+UPTIME_THRESHOLDS = {"flow": 1000.0}
+
+
+class RollingWindow:
+    """Bucketed aggregates over the last ``span`` seconds."""
+
+    def __init__(self, span: float, buckets: int = BUCKETS):
+        self.span = span
+        self.buckets = buckets
+        self.width = span / buckets
+        self.ids = np.full(buckets, -1, dtype=np.int64)  # absolute bucket number held by each slot
+        self.sum = np.zeros(buckets)
+        self.count = np.zeros(buckets, dtype=np.int64)
+        self.min = np.full(buckets, np.inf)
+        self.max = np.full(buckets, -np.inf)
+        self.held = np.zeros(buckets)   # seconds between samples that fell in the bucket
+        self.up = np.zeros(buckets)     # the part of ``held`` spent running
+
+    def _claim(self, group: np.ndarray) -> np.ndarray:
+        """Slots of the buckets numbered ``group``, emptying slots still holding older buckets."""
+        slots = group % self.buckets
+        stale = self.ids[slots] != group
+        if stale.any():
+            reset = slots[stale]
+            self.ids[reset] = group[stale]
+            self.sum[reset] = 0.0
+            self.count[reset] = 0
+            self.min[reset] = np.inf
+            self.max[reset] = -np.inf
+            self.held[reset] = 0.0
+            self.up[reset] = 0.0
+        return slots
+
+    def _claim_one(self, group: int) -> int:
+        """Scalar ``_claim``."""
+        slot = group % self.buckets
+        if self.ids[slot] != group:
+            self.ids[slot] = group
+            self.sum[slot], self.count[slot] = 0.0, 0
+            self.min[slot], self.max[slot] = np.inf, -np.inf
+            self.held[slot] = self.up[slot] = 0.0
+        return slot
+
+    def add(self, t: np.ndarray, v: np.ndarray, running: np.ndarray, prev_t: float = -np.inf,
+            prev_running: bool = False):
+        """Fold in samples with non-decreasing ``t``; ``running`` flags samples that count as uptime.
+
+        ``prev_t`` and ``prev_running`` describe the newest sample already
+        added, whose state holds until ``t[0]``.
+        """
+        ids = np.floor(t / self.width).astype(np.int64)
+        first = ids[-1] - self.buckets + 1   # oldest bucket still in the window
+        if np.isfinite(prev_t):
+            self._hold(np.r_[prev_t, t[:-1]], t, np.r_[prev_running, running[:-1]], first)
+        elif len(t) > 1:
+            self._hold(t[:-1], t[1:], running[:-1], first)
+        recent = ids >= first
+        if not recent.all():
+            ids, v = ids[recent], v[recent]
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        slots = self._claim(ids[starts])
+        self.sum[slots] += np.add.reduceat(v, starts)
+        self.count[slots] += np.diff(np.r_[starts, len(ids)])
+        self.min[slots] = np.minimum(self.min[slots], np.minimum.reduceat(v, starts))
+        self.max[slots] = np.maximum(self.max[slots], np.maximum.reduceat(v, starts))
+
+    def _hold(self, a: np.ndarray, b: np.ndarray, running: np.ndarray, first: int):
+        """Add the intervals ``[a, b)`` to ``held`` (and ``up`` where running), split at bucket edges."""
+        a = np.maximum(a, first * self.width)
+        keep = b > a
+        if not keep.all():
+            a, b, running = a[keep], b[keep], running[keep]
+        if len(a) == 0:
+            return
+        lo = np.floor(a / self.width).astype(np.int64)
+        pieces = np.floor(b / self.width).astype(np.int64) - lo + 1
+        owner = np.repeat(np.arange(len(a)), pieces)
+        group = lo[owner] + np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        seconds = np.minimum(b[owner], (group + 1) * self.width) - np.maximum(a[owner], group * self.width)
+        starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+        slots = self._claim(group[starts])
+        self.held[slots] += np.add.reduceat(seconds, starts)
+        self.up[slots] += np.add.reduceat(np.where(running[owner], seconds, 0.0), starts)
+
+    def add_one(self, t: float, v: float, running: bool, prev_t: float = -np.inf, prev_running: bool = False):
+        """Scalar ``add`` for a single sample, without array overhead."""
+        group = int(t // self.width)
+        if prev_t > -np.inf:
+            start = max(prev_t, (group - self.buckets + 1) * self.width)
+            for held_group in range(int(start // self.width), group + 1):
+                seconds = min(t, (held_group + 1) * self.width) - max(start, held_group * self.width)
+                if seconds > 0:
+                    slot = self._claim_one(held_group)
+                    self.held[slot] += seconds
+                    if prev_running:
+                        self.up[slot] += seconds
+        slot = self._claim_one(group)
+        self.sum[slot] += v
+        self.count[slot] += 1
+        if v < self.min[slot]:
+            self.min[slot] = v
+        if v > self.max[slot]:
+            self.max[slot] = v
+
+    def stats(self, now: float, hold: tuple = None) -> dict:
+        """Combine the buckets covering the ``span`` seconds up to ``now``.
+
+        With ``hold``, the time and running state of the newest sample, the
+        result includes the fraction of the covered time spent running; that
+        state is taken to last until ``now``.
+        """
+        current = int(np.floor(now / self.width))
+        live = (self.ids > current - self.buckets) & (self.ids <= current)
+        count = int(self.count[live].sum())
+        if count == 0:
+            return {"count": 0, "mean": None, "min": None, "max": None}
+        out = {
+            "count": count,
+            "mean": float(self.sum[live].sum() / count),
+            "min": float(self.min[live].min()),
+            "max": float(self.max[live].max()),
+        }
+        if hold is not None:
+            last_t, last_running = hold
+            held, up = float(self.held[live].sum()), float(self.up[live].sum())
+            open_seconds = max(now - max(last_t, (current - self.buckets + 1) * self.width), 0.0)
+            held += open_seconds
+            if last_running:
+                up += open_seconds
+            out["uptime"] = up / held if held > 0 else float(last_running)
+        return out
+
+
+class TagAggregates:
+    """Every window for one tag plus its newest sample."""
+
+    def __init__(self, threshold: float = None):
+        self.threshold = threshold
+        self.windows = {name: RollingWindow(span) for name, span in WINDOWS.items()}
+        self.last_t = -np.inf
+        self.last_v = None
+        self.last_running = False
+        self._lock = threading.Lock()
+
+    def add(self, t, v):
+        if len(t) == 1:
+            self._add_one(float(t[0]), float(v[0]))
+            return
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        with self._lock:
+            keep = advancing(t, self.last_t)
+            if not keep.all():
+                t, v = t[keep], v[keep]
+            if len(t) == 0:
+                return
+            running = v > self.threshold if self.threshold is not None else np.zeros(len(v), dtype=bool)
+            for window in self.windows.values():
+                window.add(t, v, running, self.last_t, self.last_running)
+            self.last_t, self.last_v, self.last_running = float(t[-1]), float(v[-1]), bool(running[-1])
+
+    def _add_one(self, t: float, v: float):
+        with self._lock:
+            if not t > self.last_t or not np.isfinite(t):
+                return
+            running = self.threshold is not None and v > self.threshold
+            for window in self.windows.values():
+                window.add_one(t, v, running, self.last_t, self.last_running)
+            self.last_t, self.last_v, self.last_running = t, v, running
+
+    def stats(self, now: float = None) -> dict:
+        """Window statistics ending at ``now`` (the current time by default, or the newest sample if later)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self.last_v is None:
+                return {"as_of": None, "latest": None, "windows": {}}
+            now = max(now, self.last_t)
+            hold = (self.last_t, self.last_running) if self.threshold is not None else None
+            return {
+                "as_of": self.last_t,
+                "latest": self.last_v,
+                "windows": {name: w.stats(now, hold) for name, w in self.windows.items()},
+            }
+
+
+class KpiAggregator:
+    """Per-tag rolling aggregates, created on a tag's first sample."""
+
+    def __init__(self, thresholds: dict = UPTIME_THRESHOLDS):
+        self.thresholds = thresholds
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def add(self, tag: str, t, v):
+        """Fold samples of ``tag`` into its windows; samples not later than its newest are ignored."""
+        with self._lock:
+            aggregates = self._tags.get(tag)
+            if aggregates is None:
+                aggregates = self._tags[tag] = TagAggregates(self.thresholds.get(tag))
+        aggregates.add(t, v)
+
+    def stats(self, tags=None, now: float = None) -> dict:
+        """Return the window statistics of ``tags`` (all tags by default) up to ``now``, keyed by tag."""
+        with self._lock:
+            selected = {tag: a for tag, a in self._tags.items() if tags is None or tag in tags}
+        return {tag: a.stats(now) for tag, a in sorted(selected.items())}
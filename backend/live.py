@@ -0,0 +1,128 @@
+"""Fan-out of live tag values and other feeds to Server-Sent Events subscribers.
+
+Producers call ``publish`` from any thread. Each change is
+encoded as one SSE message, once, and kept in a short ring of recent
+messages; every subscriber sends the messages after the last version it
+sent, so adding a screen costs one socket write per change and no
+recomputation. A subscriber that falls behind the ring gets a fresh
+snapshot instead.
+"""
+
+import asyncio
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+def sse_message(event: str, version: int, payload: dict) -> bytes:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\nid: {version}\ndata: {json.dumps(payload)}\n\n".encode()
+
+
+class Broadcaster(ABC):
+    """Versioned SSE messages in a ring ``backlog`` deep, fanned out to async subscribers.
+
+    Subclasses call ``_append`` under ``_lock`` and then ``_notify``, and
+    implement ``snapshot``.
+    """
+
+    def __init__(self, backlog: int = 1024):
+        self.version = 0
+        self._messages = deque(maxlen=backlog)  # (version, encoded message)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._changed = None
+        self.subscribers = 0
+
+    def _append(self, event: str, payload: dict):
+        """Encode ``payload`` as the next version; caller holds the lock."""
+        self.version += 1
+        self._messages.append((self.version, sse_message(event, self.version, {"version": self.version, **payload})))
+
+    def _notify(self):
+        """Wake the subscribers; call after releasing the lock."""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wake)
+
+    @abstractmethod
+    def snapshot(self):
+        """Return ``(version, encoded snapshot message)``."""
+
+    def since(self, version: int):
+        """Return ``(current version, encoded messages after version)``; messages are ``None`` if they left the backlog."""
+        with self._lock:
+            if version >= self.version:
+                return self.version, []
+            if not self._messages or self._messages[0][0] > version + 1:
+                return self.version, None
+            return self.version, [message for v, message in self._messages if v > version]
+
+    def _wake(self):
+        """Wake every waiting subscriber; runs on the event loop."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self, version: int, timeout: float):
+        """Wait until the feed moves past ``version`` or ``timeout`` seconds pass."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._changed = asyncio.Event()
+        changed = self._changed
+        if self.version > version:
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def stream(self, keepalive: float = 15.0):
+        """Yield a snapshot, then every new message, with comment keep-alives."""
+        self.subscribers += 1
+        try:
+            version, message = self.snapshot()
+            yield message
+            while True:
+                await self.wait(version, keepalive)
+                current, messages = self.since(version)
+                if messages is None:
+                    version, message = self.snapshot()
+                    yield message
+                elif messages:
+                    version = current
+                    yield b"".join(messages)
+                else:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.subscribers -= 1
+
+
+class LiveFeed(Broadcaster):
+    """Latest value per tag; publishes only the tags whose value changed."""
+
+    def __init__(self, backlog: int = 1024):
+        super().__init__(backlog)
+        self.latest = {}  # tag -> (t, v)
+
+    def publish(self, values: dict) -> int:
+        """Record ``{tag: (t, v)}``; tags whose value did not change are left out. Returns the version."""
+        with self._lock:
+            changed = {}
+            for tag, (t, v) in values.items():
+                previous = self.latest.get(tag)
+                self.latest[tag] = (float(t), float(v))
+                if previous is None or previous[1] != float(v):
+                    changed[tag] = {"t": float(t), "v": float(v)}
+            if not changed:
+                return self.version
+            self._append("values", {"values": changed})
+            version = self.version
+        self._notify()
+        return version
+
+    def snapshot(self):
+        """Return ``(version, encoded snapshot message)`` of every tag's latest value."""
+        with self._lock:
+            values = {tag: {"t": t, "v": v} for tag, (t, v) in self.latest.items()}
+            return self.version, sse_message("snapshot", self.version, {"version": self.version, "values": values})
@@ -1,15 +1,181 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 
+from .anomaly import AlertFeed, AnomalyDetector
+from .archive import Archive
+from .assets import AssetFleet
+from .breach import breach_forecast
+from .cache import ResultCache, canonical_key
+from .downsample import downsample, tail
+from .forecast import Forecaster
+from .historian import DEFAULT_CAPACITY, Historian
+from .importer import CsvImporter
+from .jobs import JobManager, QueueFull, run_optimization
+from .kpi import KpiAggregator
+from .live import LiveFeed
+from .optimizer import (
+    DEFAULT_TARIFFS, OptimizationProblem, Tariffs, cost_breakdown, decision_contours, encode_grid,
+    optimize_fleet, optimize_local, optimize_sampling, pareto_front, response_grid, sensitivity,
+    shutdown_pool, unit_energy,
+)
+from .retrain import ModelRegistry, RlsTrainer, describe_model
+from .schemas import (
+    AssetIngestRequest, AssetRegisterRequest, BreachRequest, ContourRequest, CostRequest, DesalterInputs, FleetRequest,
+    IngestRequest, ParetoRequest,
+    Scenario, SensitivityRequest, SurfaceRequest, TableQueryRequest, WhatIfBatchRequest, WhatIfSessionRequest,
+)
+from .tables import DEFAULT_POINTS, TableStore
+from .whatif import SCENARIO_FIELDS, SessionRegistry, Superseded, evaluate_scenarios, scenario_points
+
 
 app = FastAPI(title="Desalter Landing Backend")
 
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
 ASSETS_DIR = FRONTEND_DIR / "assets"
 
+# Computed results keyed by canonicalized request parameters
+result_cache = ResultCache(max_bytes=64 * 1024 * 1024, ttl=300.0)
+# Per-browser what-if slider sessions
+whatif_sessions = SessionRegistry()
+# Background optimization runs on a process pool
+jobs = JobManager(
+    max_workers=int(os.environ.get("DESALTER_JOB_WORKERS", 0)) or None,
+    max_queue=int(os.environ.get("DESALTER_JOB_QUEUE", 16)),
+    retention=float(os.environ.get("DESALTER_JOB_RETENTION", 600)),
+)
+# Recent samples of the monitored tags
+historian = Historian(capacity=int(os.environ.get("DESALTER_HISTORIAN_CAPACITY", DEFAULT_CAPACITY)))
+# Long-horizon history of the same tags on disk
+archive = Archive(os.environ.get("DESALTER_ARCHIVE_DIR", "desalter_data/archive"))
+# Rolling 1 min / 1 h / 24 h aggregates of every tag
+kpis = KpiAggregator()
+# Online EWMA/CUSUM detectors and the alert feed they publish to
+alert_feed = AlertFeed()
+detector = AnomalyDetector(alert_feed)
+# Changed tag values pushed to every Monitoring panel
+live_feed = LiveFeed()
+# Current response model; retrains publish new versions without pausing readers
+models = ModelRegistry()
+trainer = RlsTrainer(models)
+RETRAIN_SECONDS = float(os.environ.get("DESALTER_RETRAIN_SECONDS", 300))
+# Rolling degradation indicators of the maintained assets
+fleet = AssetFleet()
+# Hourly Holt-Winters state per tag, warmed from the archive at startup
+forecaster = Forecaster()
+FORECAST_WARM_SECONDS = float(os.environ.get("DESALTER_FORECAST_WARM_DAYS", 14)) * 86400
+# Response tables of each model version, memory-mapped from disk
+tables = TableStore(
+    os.environ.get("DESALTER_TABLE_DIR", "desalter_data/tables"),
+    points=int(os.environ.get("DESALTER_TABLE_POINTS", DEFAULT_POINTS)),
+)
+# Progress of recent CSV imports by id
+csv_imports = OrderedDict()
+
+
+@app.on_event("startup")
+def warm_forecasts():
+    since = time.time() - FORECAST_WARM_SECONDS
+    for tag in archive.tags():
+        for t, v in archive.parts(tag, since):
+            forecaster.update(tag, t, v)
+
+
+@app.on_event("startup")
+def load_response_table():
+    tables.get(models.current())
+
+
+@app.on_event("startup")
+async def start_retraining():
+    async def retrain_periodically():
+        while True:
+            await asyncio.sleep(RETRAIN_SECONDS)
+            await run_in_threadpool(trainer.retrain, historian)
+
+    if RETRAIN_SECONDS > 0:
+        app.state.retrain_task = asyncio.create_task(retrain_periodically())
+
+
+@app.on_event("shutdown")
+def stop_jobs():
+    jobs.shutdown()
+    shutdown_pool()
+    archive.flush()
+    task = getattr(app.state, "retrain_task", None)
+    if task is not None:
+        task.cancel()
+
+
+def cached_response(namespace: str, request, build, model=None):
+    """Serve ``build()``'s response from ``result_cache`` when the same parameters were seen.
+
+    Responses that depend on the response model pass it so that each model version is cached apart.
+    """
+    if model is not None:
+        namespace = f"{namespace}@{model.version}"
+    key = canonical_key(namespace, request.model_dump())
+    hit = result_cache.get(key)
+    if hit is not None:
+        body, (media_type, headers) = hit
+        return Response(body, media_type=media_type, headers={**headers, "X-Cache": "HIT"})
+    response = build()
+    if response.status_code == 200:
+        headers = {k: v for k, v in response.headers.items() if k.startswith("x-")}
+        result_cache.put(key, response.body, (response.media_type, headers))
+    response.headers["X-Cache"] = "MISS"
+    return response
+
+
+def store_samples(tag: str, t, v):
+    """Append samples of ``tag`` to the historian and the archive, run the KPI, anomaly
+    and forecast stages and publish the newest value.
+
+    Returns the number of samples each store kept.
+    """
+    kept = historian.append(tag, t, v), archive.append(tag, t, v)
+    kpis.add(tag, t, v)
+    detector.process(tag, t, v)
+    forecaster.update(tag, t, v)
+    if kept[0]:
+        live_feed.publish({tag: historian.buffer(tag).latest()})
+    return kept
+
+
+def live_point():
+    """The newest historian value of every scenario field as a ``Scenario``, or ``None`` if one is missing."""
+    values = {}
+    for name in SCENARIO_FIELDS:
+        buf = historian.buffer(name)
+        latest = buf.latest() if buf is not None else None
+        if latest is None:
+            return None
+        values[name] = latest[1]
+    return Scenario(**values)
+
+
+def series_response(tag: str, parts: list, limit: int = None, points: int = None, method: str = "lttb"):
+    """JSON for ``(t, v)`` parts of ``tag``: the newest ``limit`` samples, downsampled to ``points``."""
+    if limit is not None:
+        parts = tail(parts, limit)
+    count = sum(len(t) for t, _ in parts)
+    try:
+        t, v = downsample(parts, points if points is not None else max(count, 3), method)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"tag": tag, "count": len(t), "source_count": count, "t": t.tolist(), "v": v.tolist()})
+
 # Specific routes for assets to ensure they're served correctly
 @app.api_route("/assets/{filename}", methods=["GET", "HEAD"])
 async def serve_asset(filename: str):
@@ -46,3 +212,422 @@ async def read_results():
 @app.get("/api/ping")
 def ping():
     return JSONResponse({"message": "Desalter backend is alive", "ok": True})
+
+@app.post("/api/optimize")
+def optimize(inputs: DesalterInputs):
+    model = models.current()
+
+    def build():
+        try:
+            problem = OptimizationProblem.from_inputs(inputs.model_dump(), model)
+            if inputs.engine == "local":
+                result = optimize_local(problem, inputs.n_starts)
+            else:
+                result = optimize_sampling(problem, inputs.n_samples, seed=inputs.seed)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse(result)
+    return cached_response("optimize", inputs, build, model)
+
+# Optimize several trains at once, one pool task per unit, optionally sharing a wash-water limit
+@app.post("/api/fleet/optimize")
+def optimize_fleet_units(request: FleetRequest):
+    model = models.current()
+
+    def build():
+        settings = [unit.model_dump(include={"engine", "n_samples", "n_starts", "seed"}) for unit in request.units]
+        try:
+            problems = [OptimizationProblem.from_inputs(unit.model_dump(), model) for unit in request.units]
+            result = optimize_fleet(problems, settings, wash_limit=request.wash_water_limit)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        for unit, row in zip(request.units, result["units"]):
+            row["name"] = unit.name
+        return JSONResponse(result)
+    return cached_response("fleet", request, build, model)
+
+# Start an optimization in the background; progress streams from /events
+@app.post("/api/optimize/jobs")
+def submit_optimization(inputs: DesalterInputs):
+    model = models.current()
+
+    def remember(result):
+        # Let a later POST /api/optimize with the same inputs and model hit the cache
+        result_cache.put(canonical_key(f"optimize@{model.version}", inputs.model_dump()),
+                         JSONResponse(result).body, ("application/json", {}))
+
+    try:
+        job = jobs.submit("optimize", run_optimization, inputs.model_dump(), model, on_done=remember)
+    except QueueFull as e:
+        return JSONResponse({"error": str(e)}, status_code=429)
+    return JSONResponse({
+        "job_id": job.id,
+        "status": f"/api/optimize/jobs/{job.id}",
+        "events": f"/api/optimize/jobs/{job.id}/events",
+        "result": f"/api/optimize/jobs/{job.id}/result",
+    }, status_code=202)
+
+@app.get("/api/optimize/jobs")
+def list_optimizations():
+    return JSONResponse({"jobs": jobs.list(), **jobs.stats()})
+
+@app.get("/api/optimize/jobs/{job_id}")
+def optimization_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse(job.snapshot())
+
+@app.get("/api/optimize/jobs/{job_id}/result")
+def optimization_result(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    if job.status == "done":
+        return JSONResponse(job.result)
+    if job.is_finished:
+        return JSONResponse({"error": job.error or f"Job {job.status}"}, status_code=409)
+    return JSONResponse(job.snapshot(), status_code=202)
+
+@app.delete("/api/optimize/jobs/{job_id}")
+def cancel_optimization(job_id: str):
+    if jobs.get(job_id) is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return JSONResponse({"cancelled": jobs.cancel(job_id)})
+
+# Server-Sent Events: "progress" on every change, then one "done", "failed" or "cancelled"
+@app.get("/api/optimize/jobs/{job_id}/events")
+async def optimization_events(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+
+    async def stream():
+        seen = -1
+        idle = 0.0
+        while True:
+            if job.version != seen:
+                seen, idle = job.version, 0.0
+                event = job.status if job.is_finished else "progress"
+                data = json.dumps(job.snapshot(include_result=job.is_finished))
+                yield f"event: {event}\ndata: {data}\n\n"
+                if job.is_finished:
+                    return
+            elif idle >= 15.0:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(0.05)
+            idle += 0.05
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/pareto")
+def pareto(request: ParetoRequest):
+    model = models.current()
+
+    def build():
+        try:
+            problem = OptimizationProblem.from_inputs(request.model_dump(), model)
+            result = pareto_front(problem, request.n_samples, seed=request.seed,
+                                  feasible_only=request.feasible_only, max_points=request.max_points)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse(result)
+    return cached_response("pareto", request, build, model)
+
+# Decision-map grid as binary float32 layers (format in optimizer.surface)
+@app.post("/api/surface")
+def surface(request: SurfaceRequest):
+    model = models.current()
+
+    def build():
+        try:
+            problem = OptimizationProblem.from_inputs(request.model_dump(), model)
+            grid = response_grid(problem, request.axes, request.resolution,
+                                 fixed=request.fixed, layers=tuple(request.layers))
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return Response(
+            encode_grid(grid),
+            media_type="application/octet-stream",
+            headers={"X-Grid-Axes": ",".join(grid["axes"]), "X-Grid-Layers": ",".join(grid["layers"])},
+        )
+    return cached_response("surface", request, build, model)
+
+@app.post("/api/contours")
+def contours(request: ContourRequest):
+    model = models.current()
+
+    def build():
+        try:
+            problem = OptimizationProblem.from_inputs(request.model_dump(), model)
+            result = decision_contours(problem, request.axes, request.resolution, fixed=request.fixed,
+                                       cost_levels=request.cost_levels, n_cost_levels=request.n_cost_levels,
+                                       tolerance=request.tolerance)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse(result)
+    return cached_response("contours", request, build, model)
+
+# Sobol and Morris indices of BS&W, salt and cost; cached per range set and model version
+@app.post("/api/sensitivity")
+def sensitivity_analysis(request: SensitivityRequest):
+    model = models.current()
+
+    def build():
+        try:
+            problem = OptimizationProblem.from_inputs(request.model_dump(), model)
+            result = sensitivity(problem, request.n_base, request.n_trajectories, seed=request.seed)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return JSONResponse(result)
+    return cached_response("sensitivity", request, build, model)
+
+@app.post("/api/whatif/batch")
+def whatif_batch(request: WhatIfBatchRequest):
+    model = models.current()
+
+    def build():
+        result = evaluate_scenarios(
+            scenario_points(request.scenarios),
+            scenario_points([request.reference])[0],
+            request.spec_bsw,
+            request.spec_salt,
+            model,
+            Tariffs.from_dict(request.tariffs and request.tariffs.model_dump()),
+        )
+        return JSONResponse(result)
+    return cached_response("whatif", request, build, model)
+
+# Incremental what-if for slider drags; an older in-flight request is answered with 409
+@app.post("/api/whatif/session/{session_id}")
+def whatif_session(session_id: str, request: WhatIfSessionRequest):
+    session = whatif_sessions.get(session_id)
+    updates = {name: getattr(request, name) for name in SCENARIO_FIELDS}
+    try:
+        result = session.evaluate(updates, request.spec_bsw, request.spec_salt, models.current())
+    except Superseded as e:
+        return JSONResponse({"error": str(e), "superseded": True}, status_code=409)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(result)
+
+@app.delete("/api/whatif/session/{session_id}")
+def close_whatif_session(session_id: str):
+    return JSONResponse({"ok": whatif_sessions.close(session_id)})
+
+@app.post("/api/historian/ingest")
+def historian_ingest(request: IngestRequest):
+    accepted, archived = {}, {}
+    try:
+        for tag, series in request.series.items():
+            accepted[tag], archived[tag] = store_samples(tag, series.t, series.v)
+    except ValueError as e:
+        return JSONResponse({"error": str(e), "accepted": accepted, "archived": archived}, status_code=400)
+    return JSONResponse({"accepted": accepted, "archived": archived})
+
+@app.get("/api/historian/tags")
+def historian_tags():
+    return JSONResponse(historian.tags())
+
+# Samples of one tag with start <= t <= end; limit keeps the newest, points downsamples
+@app.get("/api/historian/{tag}")
+def historian_range(tag: str, start: float = None, end: float = None, limit: int = None,
+                    points: int = None, method: str = "lttb"):
+    try:
+        parts = [historian.range(tag, start, end)]
+    except KeyError:
+        return JSONResponse({"error": f"Unknown tag: {tag}"}, status_code=404)
+    return series_response(tag, parts, limit, points, method)
+
+# Raw CSV request body, parsed block by block as it arrives (layouts in backend.importer)
+@app.post("/api/import/csv")
+async def import_csv(request: Request, import_id: str = None):
+    import_id = import_id or uuid.uuid4().hex
+    length = request.headers.get("content-length")
+    importer = CsvImporter(store_samples, total_bytes=int(length) if length else None)
+    csv_imports[import_id] = importer
+    while len(csv_imports) > 32:
+        csv_imports.popitem(last=False)
+    try:
+        async for data in request.stream():
+            await run_in_threadpool(importer.feed, data)
+        result = await run_in_threadpool(importer.close)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JSONResponse({"error": str(e), "import_id": import_id, **importer.progress()}, status_code=400)
+    return JSONResponse({"import_id": import_id, **result})
+
+@app.get("/api/import/{import_id}")
+def import_progress(import_id: str):
+    importer = csv_imports.get(import_id)
+    if importer is None:
+        return JSONResponse({"error": "Import not found"}, status_code=404)
+    return JSONResponse({"import_id": import_id, **importer.progress()})
+
+# Precomputed rolling-window mean/min/max/count (and uptime for flow); tags is comma-separated
+@app.get("/api/kpi")
+def kpi(tags: str = None):
+    return JSONResponse(kpis.stats(tags.split(",") if tags else None))
+
+# Newest alerts first; since is the last alert id already seen
+@app.get("/api/alerts")
+def alerts(tag: str = None, since: int = 0, limit: int = 100):
+    return JSONResponse({"alerts": alert_feed.list(tag, since, limit), "detectors": detector.state()})
+
+# Server-Sent Events: a "snapshot" of recent alerts, then an "alerts" event per batch that raised any
+@app.get("/api/alerts/events")
+async def alert_events():
+    return StreamingResponse(alert_feed.stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# Server-Sent Events: a "snapshot" of every tag, then "values" events with changed tags only
+@app.get("/api/live/events")
+async def live_events():
+    return StreamingResponse(live_feed.stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/archive/tags")
+def archive_tags():
+    return JSONResponse(archive.tags())
+
+# Archived samples of one tag; only the chunks overlapping start..end are read
+@app.get("/api/archive/{tag}")
+def archive_range(tag: str, start: float = None, end: float = None, limit: int = None,
+                  points: int = None, method: str = "lttb"):
+    try:
+        parts = archive.parts(tag, start, end)
+    except KeyError:
+        return JSONResponse({"error": f"Unknown tag: {tag}"}, status_code=404)
+    return series_response(tag, parts, limit, points, method)
+
+# Monte Carlo breach risk from the given point, else the live tag values, else the input-page baseline
+@app.post("/api/breach")
+def breach(request: BreachRequest):
+    if request.point is not None:
+        point, source = request.point, "request"
+    else:
+        live = live_point()
+        if live is not None:
+            point, source = live, "live"
+        else:
+            point, source = WhatIfBatchRequest.model_fields["reference"].default, "baseline"
+    try:
+        result = breach_forecast(
+            scenario_points([point])[0], request.spec_bsw, request.spec_salt,
+            horizon_hours=request.horizon_hours, step_minutes=request.step_minutes, n_draws=request.n_draws,
+            drift=request.drift, measurement_sd=request.measurement_sd, drift_sd=request.drift_sd,
+            seed=request.seed, model=models.current(),
+        )
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"point": point.model_dump(), "source": source, **result})
+
+@app.post("/api/assets")
+def register_assets(request: AssetRegisterRequest):
+    try:
+        for spec in request.assets:
+            fleet.register(spec.id, spec.name, spec.area, spec.kind, spec.impact, spec.rated_load)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"assets": len(fleet.ids)})
+
+@app.post("/api/assets/ingest")
+def assets_ingest(request: AssetIngestRequest):
+    samples = {asset: {signal: (series.t, series.v) for signal, series in signals.items()}
+               for asset, signals in request.samples.items()}
+    try:
+        kept = fleet.ingest(samples)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"accepted": kept})
+
+# One page of asset health, filtered and sorted on the server, plus a fleet summary
+@app.get("/api/assets")
+def assets(risk: str = None, area: str = None, kind: str = None, q: str = None, due_within: float = None,
+           sort: str = "health", order: str = "asc", page: int = 1, page_size: int = 50):
+    try:
+        result = fleet.listing(risk, area, kind, q, due_within, sort, order, page, page_size)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse(result)
+
+@app.get("/api/model")
+def model_info():
+    return JSONResponse(describe_model(models.current()))
+
+# Fold in the samples ingested since the last retrain and swap in the new model version
+@app.post("/api/model/retrain")
+def retrain_model():
+    result = trainer.retrain(historian)
+    return JSONResponse({**result, "model": describe_model(models.current())})
+
+@app.get("/api/cost/tariffs")
+def default_tariffs():
+    return JSONResponse(asdict(DEFAULT_TARIFFS))
+
+# Cost components and energy of each point per bbl, plus daily totals at the point's flow
+@app.post("/api/cost")
+def operating_cost(request: CostRequest):
+    try:
+        tariffs = Tariffs.from_dict(request.tariffs and request.tariffs.model_dump())
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    X = scenario_points(request.points)
+    parts = cost_breakdown(X, tariffs)
+    cost = sum(parts.values())
+    energy = unit_energy(X, tariffs)
+    return JSONResponse({
+        "tariffs": asdict(tariffs),
+        "cost_per_bbl": cost.tolist(),
+        "components": {name: v.tolist() for name, v in parts.items()},
+        "energy_kwh_per_bbl": energy.tolist(),
+        "cost_per_day": (cost * X[:, 0]).tolist(),
+        "energy_kwh_per_day": (energy * X[:, 0]).tolist(),
+    })
+
+# Grid, file and load time of the current model's response table (built if missing)
+@app.get("/api/table")
+def table_info():
+    _, info = tables.get(models.current())
+    return JSONResponse(info)
+
+@app.post("/api/table/build")
+def build_table():
+    _, info = tables.get(models.current(), rebuild=True)
+    return JSONResponse(info)
+
+# Multilinear lookups of BS&W, salt and energy; points outside the envelope are clamped
+@app.post("/api/table/query")
+def table_query(request: TableQueryRequest):
+    model = models.current()
+    table, info = tables.get(model)
+    X = scenario_points(request.points)
+    values = table.query(X)
+    return JSONResponse({
+        "model_version": model.version,
+        **{name: v.tolist() for name, v in values.items()},
+        "inside": table.contains(X).tolist(),
+    })
+
+# Next hourly means of a tag with 95% bands, read from the incrementally updated state
+@app.get("/api/forecast/{tag}")
+def forecast(tag: str, horizon: int = 24):
+    try:
+        result = forecaster.forecast(tag, horizon)
+    except KeyError:
+        return JSONResponse({"error": f"Unknown tag: {tag}"}, status_code=404)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if result is None:
+        return JSONResponse({"error": f"Not enough history to forecast {tag}"}, status_code=404)
+    return JSONResponse(result)
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    return JSONResponse(result_cache.stats())
+
+@app.delete("/api/cache")
+def clear_cache():
+    result_cache.clear()
+    return JSONResponse({"ok": True})
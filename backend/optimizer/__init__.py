@@ -0,0 +1,41 @@
+"""Desalter setpoint optimization on a vectorized response model."""
+
+from .contours import contour_lines, decision_contours
+from .cost import COST_COMPONENTS, DEFAULT_TARIFFS, Tariffs, cost_breakdown, unit_cost, unit_energy
+from .fleet import optimize_fleet
+from .local_search import optimize_local, shutdown_pool
+from .model import DEFAULT_MODEL, VARIABLES, ResponseModel, as_points, features
+from .pareto import non_dominated, pareto_front
+from .problem import OptimizationProblem, describe_point
+from .sampling import MAX_SAMPLES, optimize_sampling
+from .sensitivity import sensitivity
+from .surface import AXIS_PAIRS, encode_grid, response_grid
+
+__all__ = [
+    "AXIS_PAIRS",
+    "COST_COMPONENTS",
+    "DEFAULT_MODEL",
+    "DEFAULT_TARIFFS",
+    "MAX_SAMPLES",
+    "OptimizationProblem",
+    "ResponseModel",
+    "Tariffs",
+    "VARIABLES",
+    "as_points",
+    "contour_lines",
+    "cost_breakdown",
+    "decision_contours",
+    "describe_point",
+    "encode_grid",
+    "features",
+    "non_dominated",
+    "optimize_fleet",
+    "optimize_local",
+    "optimize_sampling",
+    "pareto_front",
+    "response_grid",
+    "sensitivity",
+    "shutdown_pool",
+    "unit_cost",
+    "unit_energy",
+]
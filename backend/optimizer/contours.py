@@ -0,0 +1,192 @@
+"""Marching-squares iso-contours over decision-map grids.
+
+Cell classification and edge interpolation are vectorized over the whole
+grid; only the short walk that chains segments into polylines, and the
+Ramer-Douglas-Peucker simplification, loop in Python, and both scale with
+the number of contour vertices rather than the number of grid cells.
+"""
+
+import numpy as np
+
+from .problem import OptimizationProblem
+from .surface import response_grid
+
+# Cell edges: 0 bottom, 1 right, 2 top, 3 left. Segments per corner case,
+# corners ordered bottom-left, bottom-right, top-right, top-left (bit 0..3).
+_SEGMENTS = {
+    1: ((3, 0),), 2: ((0, 1),), 3: ((3, 1),), 4: ((1, 2),),
+    6: ((0, 2),), 7: ((3, 2),), 8: ((2, 3),), 9: ((0, 2),),
+    11: ((1, 2),), 12: ((1, 3),), 13: ((0, 1),), 14: ((0, 3),),
+}
+# Saddle cases, keyed by (case, centre above level)
+_SADDLES = {
+    (5, True): ((0, 1), (2, 3)), (5, False): ((3, 0), (1, 2)),
+    (10, True): ((3, 0), (1, 2)), (10, False): ((0, 1), (2, 3)),
+}
+
+
+def _segment_table():
+    """Build ``(16, 2, 2)`` edge-pair tables for plain and saddle cells (-1 = unused)."""
+    plain = np.full((16, 2, 2), -1, dtype=np.intp)
+    for case, segs in _SEGMENTS.items():
+        plain[case, :len(segs)] = segs
+    saddle_above = plain.copy()
+    for (case, above), segs in _SADDLES.items():
+        (saddle_above if above else plain)[case] = segs
+    return plain, saddle_above
+
+
+_PLAIN, _SADDLE_ABOVE = _segment_table()
+
+
+def marching_squares(Z: np.ndarray, level: float):
+    """Return contour segments of ``Z`` at ``level`` as pairs of grid-edge ids.
+
+    Also returns the ``(n_edges, 2)`` array of edge crossing positions in
+    fractional (column, row) grid coordinates. Horizontal edge ``(i, j)``
+    joins nodes ``(i, j)``-``(i, j + 1)`` and has id ``i * (nx - 1) + j``;
+    vertical edge ``(i, j)`` joins ``(i, j)``-``(i + 1, j)`` and has id
+    ``ny * (nx - 1) + i * nx + j``.
+    """
+    Z = np.asarray(Z, dtype=np.float64)
+    ny, nx = Z.shape
+    n_h = ny * (nx - 1)
+
+    above = Z >= level
+    case = (above[:-1, :-1].astype(np.intp)
+            | above[:-1, 1:] << 1
+            | above[1:, 1:] << 2
+            | above[1:, :-1] << 3)
+    centre = 0.25 * (Z[:-1, :-1] + Z[:-1, 1:] + Z[1:, 1:] + Z[1:, :-1]) >= level
+    table = np.where(centre[..., None, None], _SADDLE_ABOVE[case], _PLAIN[case])
+
+    i, j = np.mgrid[0:ny - 1, 0:nx - 1]
+    edge_ids = np.stack([
+        i * (nx - 1) + j,              # bottom
+        n_h + i * nx + j + 1,          # right
+        (i + 1) * (nx - 1) + j,        # top
+        n_h + i * nx + j,              # left
+    ], axis=-1)
+    used = table[..., 0] >= 0
+    local = table[used]                                  # (m, 2) edge slots
+    cells = np.repeat(edge_ids[..., None, :], 2, axis=-2)[used]
+    segments = np.take_along_axis(cells, local, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        th = (level - Z[:, :-1]) / (Z[:, 1:] - Z[:, :-1])
+        tv = (level - Z[:-1, :]) / (Z[1:, :] - Z[:-1, :])
+    hi, hj = np.mgrid[0:ny, 0:nx - 1]
+    vi, vj = np.mgrid[0:ny - 1, 0:nx]
+    points = np.concatenate([
+        np.stack([hj + np.nan_to_num(th, nan=0.5), hi], axis=-1).reshape(-1, 2),
+        np.stack([vj, vi + np.nan_to_num(tv, nan=0.5)], axis=-1).reshape(-1, 2),
+    ]).astype(np.float64)
+    return segments, points
+
+
+def chain_segments(segments: np.ndarray) -> list:
+    """Join edge-id segments into polylines (lists of edge ids); closed loops repeat their first id."""
+    neighbours = {}
+    for a, b in segments.tolist():
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    lines = []
+    # Open chains start at border edges (degree 1); whatever remains is closed loops
+    starts = [e for e, nb in neighbours.items() if len(nb) == 1]
+    for start in starts + list(neighbours):
+        if not neighbours.get(start):
+            continue
+        line = [start]
+        current = start
+        while neighbours.get(current):
+            nxt = neighbours[current].pop()
+            neighbours[nxt].remove(current)
+            line.append(nxt)
+            current = nxt
+        lines.append(line)
+    return lines
+
+
+def simplify(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker simplification of an ``(n, 2)`` polyline."""
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        seg = b - a
+        inner = points[first + 1:last]
+        norm = np.hypot(*seg)
+        if norm == 0:
+            dist = np.hypot(*(inner - a).T)
+        else:
+            dist = np.abs(seg[0] * (inner[:, 1] - a[1]) - seg[1] * (inner[:, 0] - a[0])) / norm
+        k = int(np.argmax(dist))
+        if dist[k] > tolerance:
+            mid = first + 1 + k
+            keep[mid] = True
+            stack.extend(((first, mid), (mid, last)))
+    return points[keep]
+
+
+def contour_lines(Z: np.ndarray, level: float, xs: np.ndarray, ys: np.ndarray,
+                  tolerance: float = 0.002) -> list:
+    """Return simplified polylines of ``Z`` at ``level`` in data coordinates.
+
+    ``tolerance`` is a fraction of the plot extent, so it means the same on
+    both axes regardless of their units.
+    """
+    segments, grid_points = marching_squares(Z, level)
+    if not len(segments):
+        return []
+    ny, nx = Z.shape
+    polylines = []
+    for line in chain_segments(segments):
+        unit = grid_points[line] / [nx - 1, ny - 1]
+        unit = simplify(unit, tolerance)
+        x = xs[0] + unit[:, 0] * (xs[-1] - xs[0])
+        y = ys[0] + unit[:, 1] * (ys[-1] - ys[0])
+        polylines.append(np.column_stack([x, y]))
+    return polylines
+
+
+def decision_contours(problem: OptimizationProblem, axes: str, resolution: int = 256,
+                      fixed: dict = None, cost_levels=None, n_cost_levels: int = 4,
+                      tolerance: float = 0.002) -> dict:
+    """Return the spec boundaries and iso-cost lines of the decision map for ``axes``.
+
+    Without explicit ``cost_levels``, ``n_cost_levels`` levels are spread
+    evenly inside the cost range of the grid.
+    """
+    grid = response_grid(problem, axes, resolution, fixed=fixed, layers=("bsw", "salt", "cost"))
+    layers = grid["layers"]
+    if cost_levels is None:
+        lo, hi = float(layers["cost"].min()), float(layers["cost"].max())
+        cost_levels = np.linspace(lo, hi, n_cost_levels + 2)[1:-1].tolist()
+
+    requested = [("bsw", problem.spec_bsw, "spec_bsw"), ("salt", problem.spec_salt, "spec_salt")]
+    requested += [("cost", float(level), "iso_cost") for level in cost_levels]
+
+    contours = []
+    for layer, level, label in requested:
+        lines = contour_lines(layers[layer], level, grid["x"], grid["y"], tolerance)
+        contours.append({
+            "layer": layer,
+            "level": level,
+            "label": label,
+            "polylines": [line.round(6).tolist() for line in lines],
+        })
+    return {
+        "axes": list(grid["axes"]),
+        "x_range": [float(grid["x"][0]), float(grid["x"][-1])],
+        "y_range": [float(grid["y"][0]), float(grid["y"][-1])],
+        "resolution": resolution,
+        "n_vertices": sum(len(line) for c in contours for line in c["polylines"]),
+        "contours": contours,
+    }
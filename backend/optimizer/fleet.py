@@ -0,0 +1,149 @@
+"""Optimization of several desalter trains in one call.
+
+Units are independent problems, so each one is optimized by its own task
+on the process pool shared with the local search. With a fleet wash-water
+limit every task also returns the lower convex frontier of its candidates
+in (wash water, objective); the parent then takes the cheapest
+water-saving moves along those frontiers across all units until the fleet
+fits, which is the allocation a single Lagrange multiplier on wash water
+would give.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from .local_search import _get_pool, optimize_local
+from .model import FLOW, WASH
+from .problem import describe_point
+from .sampling import draw_candidates, optimize_sampling
+
+MAX_UNITS = 200
+FRONTIER_SAMPLES = 3000   # candidates per unit behind the water frontier, at least
+
+
+def wash_water(X: np.ndarray) -> np.ndarray:
+    """Wash water in bbl/day for every row of ``X`` (wash is a percentage of the crude flow)."""
+    return X[:, FLOW] * X[:, WASH] / 100.0
+
+
+def water_frontier(X: np.ndarray, objective: np.ndarray) -> np.ndarray:
+    """Indices of the lower convex hull of ``(wash_water(X), objective)`` up to the best objective.
+
+    Ordered by increasing water, so the objective falls along it and the
+    last index is the best point; using more water than that never helps.
+    """
+    water = wash_water(X)
+    order = np.lexsort((objective, water))
+    order = order[:np.flatnonzero(order == int(np.argmin(objective)))[0] + 1]
+    hull = []
+    for i in order.tolist():
+        if hull and objective[i] >= objective[hull[-1]]:
+            continue
+        while len(hull) >= 2:
+            a, b = hull[-2], hull[-1]
+            # b is not on the hull if it lies on or above the segment a -> i
+            if (objective[b] - objective[a]) * (water[i] - water[a]) < \
+                    (objective[i] - objective[a]) * (water[b] - water[a]):
+                break
+            hull.pop()
+        hull.append(i)
+    return np.array(hull, dtype=np.int64)
+
+
+def allocate_water(frontiers: list, limit: float):
+    """Pick one point per unit frontier so the total wash water fits ``limit`` at the least objective.
+
+    Every unit starts at its best (last) point. A move is one step down a
+    frontier; moves are taken in order of objective increase per bbl/day
+    saved, which keeps each unit's moves in sequence because the frontiers
+    are convex. Returns the chosen points, the price of the last move taken
+    (objective per bbl/day, 0 when the limit is slack) and whether the
+    limit was met.
+    """
+    units, prices, savings = [], [], []
+    for u, (X, objective) in enumerate(frontiers):
+        water = wash_water(X)[::-1]
+        objective = objective[::-1]
+        saved = water[:-1] - water[1:]
+        units.append(np.full(len(saved), u))
+        savings.append(saved)
+        prices.append((objective[1:] - objective[:-1]) / np.maximum(saved, 1e-12))
+    units, prices, savings = np.concatenate(units), np.concatenate(prices), np.concatenate(savings)
+    order = np.argsort(prices, kind="stable")
+    units, prices, savings = units[order], prices[order], savings[order]
+
+    excess = sum(float(wash_water(X[-1:])[0]) for X, _ in frontiers) - limit
+    steps = np.zeros(len(frontiers), dtype=np.int64)
+    price = 0.0
+    if excess > 0 and len(savings):
+        taken = min(int(np.searchsorted(np.cumsum(savings), excess)) + 1, len(savings))
+        steps = np.bincount(units[:taken], minlength=len(frontiers))
+        price = float(prices[taken - 1])
+        excess -= float(savings[:taken].sum())
+    chosen = [X[len(X) - 1 - s] for (X, _), s in zip(frontiers, steps.tolist())]
+    return chosen, price, bool(excess <= 1e-6)
+
+
+def _optimize_unit(args):
+    """Optimize one unit; with ``frontier`` set, also return its water frontier."""
+    problem, settings, frontier = args
+    if settings.get("engine") == "local":
+        result = optimize_local(problem, settings.get("n_starts", 8), parallel=False)
+    else:
+        result = optimize_sampling(problem, settings.get("n_samples", 3000), seed=settings.get("seed"))
+    if frontier:
+        rng = np.random.default_rng(settings.get("seed"))
+        n = max(settings.get("n_samples", 0), FRONTIER_SAMPLES)
+        best = np.array(list(result["setpoints"].values()))
+        X = np.vstack([draw_candidates(problem, n, rng), best])
+        objective = problem.objective(X)
+        keep = water_frontier(X, objective)
+        result["frontier"] = (X[keep], objective[keep])
+        result["n_evaluations"] += len(X)
+    return result
+
+
+def optimize_fleet(problems: list, settings: list = None, wash_limit: float = None,
+                   parallel: bool = True) -> dict:
+    """Optimize every unit and summarize the fleet.
+
+    ``settings`` holds one dict per unit with ``engine``, ``n_samples``,
+    ``n_starts`` and ``seed`` as taken by the single-unit optimizers. With
+    ``wash_limit`` (bbl/day) the units' combined wash water is kept within
+    it; each unit then also reports its ``unconstrained`` optimum.
+    """
+    if not 1 <= len(problems) <= MAX_UNITS:
+        raise ValueError(f"A fleet must have between 1 and {MAX_UNITS} units")
+    settings = settings or [{}] * len(problems)
+
+    start = time.perf_counter()
+    tasks = [(problem, s, wash_limit is not None) for problem, s in zip(problems, settings)]
+    if parallel and len(tasks) > 1 and (os.cpu_count() or 1) > 1:
+        results = list(_get_pool().map(_optimize_unit, tasks))
+    else:
+        results = [_optimize_unit(task) for task in tasks]
+
+    summary = {}
+    if wash_limit is not None:
+        chosen, price, met = allocate_water([r.pop("frontier") for r in results], wash_limit)
+        for problem, result, x in zip(problems, results, chosen):
+            result["unconstrained"] = describe_point(problem, np.array(list(result["setpoints"].values())))
+            result.update(describe_point(problem, x))
+            result["feasible"] = bool(result["bsw_within_spec"] and result["salt_within_spec"])
+        summary.update({"wash_water_limit": wash_limit, "wash_limit_met": met, "wash_water_price": price})
+
+    X = np.array([list(r["setpoints"].values()) for r in results])
+    cost = np.array([r["cost_per_bbl"] for r in results]) * X[:, FLOW]
+    summary.update({
+        "units": len(results),
+        "feasible_units": sum(bool(r["feasible"]) for r in results),
+        "total_flow": float(X[:, FLOW].sum()),
+        "total_wash_water": float(wash_water(X).sum()),
+        "total_cost_per_day": float(cost.sum()),
+        "cost_per_bbl": float(cost.sum() / X[:, FLOW].sum()),
+        "n_evaluations": sum(r["n_evaluations"] for r in results),
+        "elapsed_ms": (time.perf_counter() - start) * 1000.0,
+    })
+    return {"units": results, "summary": summary}
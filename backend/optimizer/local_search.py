@@ -0,0 +1,172 @@
+"""Multi-start bounded Nelder-Mead optimizer.
+
+Each start runs a Nelder-Mead simplex in the unit box (trial points are
+projected back onto the bounds), so the search is deterministic for a given
+problem and number of starts. Starts are independent and run in parallel on a
+process pool.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .problem import OptimizationProblem, describe_point
+
+HALTON_BASES = (2, 3, 5, 7, 11, 13)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use.
+
+    Workers are spawned rather than forked: the server process runs threads,
+    and forking it could copy a lock some other thread holds.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the shared pool if it was started; the next ``_get_pool`` starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def halton(n: int, dim: int) -> np.ndarray:
+    """Return the first ``n`` points of the ``dim``-dimensional Halton sequence (skipping 0)."""
+    out = np.empty((n, dim))
+    for d, base in enumerate(HALTON_BASES[:dim]):
+        for i in range(n):
+            k, f, r = i + 1, 1.0, 0.0
+            while k > 0:
+                f /= base
+                r += f * (k % base)
+                k //= base
+            out[i, d] = r
+    return out
+
+
+def start_points(n_starts: int, dim: int) -> np.ndarray:
+    """Return deterministic unit-box starts: the box centre, then Halton points."""
+    return np.vstack([np.full((1, dim), 0.5), halton(n_starts - 1, dim)])[:n_starts]
+
+
+def nelder_mead(problem: OptimizationProblem, u0: np.ndarray, max_evals: int = 1000,
+                xtol: float = 1e-4, ftol: float = 1e-7, step: float = 0.1) -> dict:
+    """Minimize ``problem`` from unit-box point ``u0``; returns the best point and counters."""
+    span = problem.upper - problem.lower
+    dim = u0.size
+    nfev = 0
+
+    def f(points):
+        nonlocal nfev
+        nfev += len(points)
+        return problem.objective(problem.lower + np.clip(points, 0.0, 1.0) * span)
+
+    simplex = np.repeat(u0[None, :], dim + 1, axis=0)
+    for i in range(dim):
+        simplex[i + 1, i] += step if u0[i] + step <= 1.0 else -step
+    fvals = f(simplex)
+
+    nit = 0
+    converged = False
+    while nfev < max_evals:
+        order = np.argsort(fvals)
+        simplex, fvals = simplex[order], fvals[order]
+        if (np.max(np.abs(simplex[1:] - simplex[0])) <= xtol
+                and fvals[-1] - fvals[0] <= ftol):
+            converged = True
+            break
+        nit += 1
+
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = np.clip(2.0 * centroid - simplex[-1], 0.0, 1.0)
+        fr = f(reflected[None, :])[0]
+        if fr < fvals[0]:
+            expanded = np.clip(3.0 * centroid - 2.0 * simplex[-1], 0.0, 1.0)
+            fe = f(expanded[None, :])[0]
+            simplex[-1], fvals[-1] = (expanded, fe) if fe < fr else (reflected, fr)
+        elif fr < fvals[-2]:
+            simplex[-1], fvals[-1] = reflected, fr
+        else:
+            if fr < fvals[-1]:
+                contracted = 0.5 * (centroid + reflected)
+            else:
+                contracted = 0.5 * (centroid + simplex[-1])
+            fc = f(contracted[None, :])[0]
+            if fc < min(fr, fvals[-1]):
+                simplex[-1], fvals[-1] = contracted, fc
+            else:
+                # Shrink towards the best vertex
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                fvals[1:] = f(simplex[1:])
+
+    best = int(np.argmin(fvals))
+    return {
+        "x": problem.lower + np.clip(simplex[best], 0.0, 1.0) * span,
+        "objective": float(fvals[best]),
+        "nfev": nfev,
+        "nit": nit,
+        "converged": converged,
+    }
+
+
+def _run_start(args):
+    """Process-pool entry point for one start."""
+    problem, u0, max_evals = args
+    return nelder_mead(problem, u0, max_evals=max_evals)
+
+
+def optimize_local(problem: OptimizationProblem, n_starts: int = 8,
+                   max_evals_per_start: int = 1000, parallel: bool = True, progress=None) -> dict:
+    """Run ``n_starts`` Nelder-Mead searches and return the best result with counters.
+
+    ``progress(phase, evaluated, total, best_objective)`` is called as each
+    start finishes, with start counts in place of evaluation counts.
+    """
+    if n_starts < 1:
+        raise ValueError("n_starts must be at least 1")
+
+    start = time.perf_counter()
+    starts = start_points(n_starts, problem.lower.size)
+    tasks = [(problem, u0, max_evals_per_start) for u0 in starts]
+    if parallel and n_starts > 1 and (os.cpu_count() or 1) > 1:
+        pending = _get_pool().map(_run_start, tasks)
+    else:
+        pending = map(_run_start, tasks)
+    runs = []
+    for run in pending:
+        runs.append(run)
+        if progress:
+            progress("searching", len(runs), n_starts, min(r["objective"] for r in runs))
+    elapsed = time.perf_counter() - start
+
+    best = min(runs, key=lambda r: r["objective"])
+    result = describe_point(problem, best["x"])
+    result.update({
+        "engine": "local",
+        "feasible": bool(result["bsw_within_spec"] and result["salt_within_spec"]),
+        "n_evaluations": sum(r["nfev"] for r in runs),
+        "converged": best["converged"],
+        "starts": [
+            {"objective": r["objective"], "nfev": r["nfev"], "iterations": r["nit"], "converged": r["converged"]}
+            for r in runs
+        ],
+        "elapsed_ms": elapsed * 1000.0,
+    })
+    if problem.baseline is not None:
+        result["baseline"] = describe_point(problem, problem.baseline)
+    return result
@@ -0,0 +1,103 @@
+"""Vectorized desalter response model.
+
+Every function here works on a ``(n, 5)`` array of operating points whose
+columns follow ``VARIABLES``, so a whole batch of candidates is scored with
+a handful of NumPy operations and no Python-level loop.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Column order of every operating-point array in the optimizer package
+VARIABLES = ("flow", "T", "V", "ppm", "wash")
+FLOW, TEMP, VOLT, PPM, WASH = range(len(VARIABLES))
+
+FEATURE_NAMES = (
+    "bias",           # constant term
+    "load",           # flow / design flow, residence-time loss
+    "demulsifier",    # exp(-ppm / 40), diminishing chemical returns
+    "viscosity",      # exp(-(T - 100) / 20), hot crude separates faster
+    "field",          # 50 / V, weaker grid field -> poorer coalescence
+    "wash",           # wash water % carried over as free water
+    "wash_sq",        # emulsion tightening at high wash rates
+    "dilution",       # exp(-wash / 1.5), brine left undiluted
+)
+
+DESIGN_FLOW = 50000.0   # BPD
+BSW_FLOOR = 0.01        # %
+SALT_FLOOR = 0.05       # PTB
+
+
+# Feature columns driven by each variable; the model is additive across variables
+FEATURE_GROUPS = {FLOW: (1,), TEMP: (3,), VOLT: (4,), PPM: (2,), WASH: (5, 6, 7)}
+
+
+def variable_features(var: int, values: np.ndarray) -> np.ndarray:
+    """Build the ``FEATURE_GROUPS[var]`` columns for a 1-D array of ``var`` values."""
+    v = np.asarray(values, dtype=np.float64)
+    if var == FLOW:
+        return (v / DESIGN_FLOW)[:, None]
+    if var == TEMP:
+        return np.exp(-(v - 100.0) / 20.0)[:, None]
+    if var == VOLT:
+        return (50.0 / v)[:, None]
+    if var == PPM:
+        return np.exp(-v / 40.0)[:, None]
+    return np.column_stack([v, np.square(v), np.exp(-v / 1.5)])
+
+
+def features(X: np.ndarray) -> np.ndarray:
+    """Build the ``(n, len(FEATURE_NAMES))`` regressor matrix for ``X``."""
+    X = np.asarray(X, dtype=np.float64)
+    phi = np.empty((X.shape[0], len(FEATURE_NAMES)))
+    phi[:, 0] = 1.0
+    for var, cols in FEATURE_GROUPS.items():
+        phi[:, cols] = variable_features(var, X[:, var])
+    return phi
+
+
+@dataclass(frozen=True, eq=False)
+class ResponseModel:
+    """Linear-in-parameters BS&W (%) and salt (PTB) model."""
+
+    bsw_coef: np.ndarray
+    salt_coef: np.ndarray
+    version: int = 0
+    meta: dict = field(default_factory=dict)
+
+    def predict_features(self, phi: np.ndarray):
+        """Return ``(bsw, salt)`` arrays for a prebuilt feature matrix."""
+        bsw = np.maximum(phi @ self.bsw_coef, BSW_FLOOR)
+        salt = np.maximum(phi @ self.salt_coef, SALT_FLOOR)
+        return bsw, salt
+
+    def predict(self, X: np.ndarray):
+        """Return ``(bsw, salt)`` arrays for the operating points in ``X``."""
+        return self.predict_features(features(X))
+
+    def bias(self) -> np.ndarray:
+        """Return the constant ``(bsw, salt)`` terms."""
+        return np.array([self.bsw_coef[0], self.salt_coef[0]])
+
+    def partial(self, var: int, values: np.ndarray) -> np.ndarray:
+        """Return the ``(n, 2)`` BS&W and salt contributions of ``var`` alone.
+
+        Predictions are ``max(bias + sum of partials over VARIABLES, floor)``,
+        so a change in one variable only needs that variable's partial redone.
+        """
+        cols = list(FEATURE_GROUPS[var])
+        block = variable_features(var, values)
+        return np.column_stack([block @ self.bsw_coef[cols], block @ self.salt_coef[cols]])
+
+
+DEFAULT_MODEL = ResponseModel(
+    bsw_coef=np.array([0.0, 0.16, 0.75, 0.22, 0.16, 0.01, 0.006, 0.0]),
+    salt_coef=np.array([0.3, 1.3, 3.2, 1.1, 1.0, 0.0, 0.05, 5.5]),
+)
+
+
+def as_points(flow, T, V, ppm, wash) -> np.ndarray:
+    """Stack broadcastable per-variable arrays into an ``(n, 5)`` array."""
+    cols = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (flow, T, V, ppm, wash)))
+    return np.stack([c.ravel() for c in cols], axis=1)
@@ -0,0 +1,126 @@
+"""Cost vs BS&W vs salt Pareto front over a sampled candidate batch."""
+
+import time
+
+import numpy as np
+
+from .model import VARIABLES
+from .problem import OptimizationProblem
+from .sampling import MAX_SAMPLES, draw_candidates
+
+OBJECTIVES = ("cost_per_bbl", "bsw", "salt")
+
+
+def _dominates(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Return the ``(len(A), len(B))`` matrix of "row of A dominates row of B"."""
+    a, b = A[:, None, :], B[None, :, :]
+    return np.all(a <= b, axis=2) & np.any(a < b, axis=2)
+
+
+def _grid_prefilter(F: np.ndarray, bins: int = 128) -> np.ndarray:
+    """Return a mask of rows of a 3-objective ``F`` that may be non-dominated.
+
+    Objectives 1 and 2 are binned on a ``bins`` x ``bins`` grid and a 2D
+    prefix minimum of objective 0 is taken over the cells. A row is certainly
+    dominated when some cell strictly below and left of its own holds a lower
+    objective 0, so only rows near the front survive. The test never drops a
+    front row.
+    """
+    lo = F[:, 1:].min(axis=0)
+    width = np.ptp(F[:, 1:], axis=0) / bins
+    width[width == 0] = 1.0
+    cell = np.minimum(((F[:, 1:] - lo) / width).astype(np.intp), bins - 1)
+
+    best = np.full((bins + 1, bins + 1), np.inf)
+    np.minimum.at(best, (cell[:, 0] + 1, cell[:, 1] + 1), F[:, 0])
+    np.minimum.accumulate(best, axis=0, out=best)
+    np.minimum.accumulate(best, axis=1, out=best)
+    # best[i, j] now covers cells (< i, < j) in the original indexing
+    return best[cell[:, 0], cell[:, 1]] > F[:, 0]
+
+
+def non_dominated(F: np.ndarray, block: int = 64) -> np.ndarray:
+    """Return indices of the rows of ``F`` (to be minimized) that no other row dominates.
+
+    Three-objective inputs are first thinned with a grid prefilter; the
+    survivors go through an exact block-wise cull.
+    """
+    F = np.asarray(F, dtype=np.float64)
+    if not len(F):
+        return np.empty(0, dtype=np.intp)
+    if F.shape[1] == 3:
+        survivors = np.flatnonzero(_grid_prefilter(F))
+        return survivors[_cull(F[survivors], block)]
+    return _cull(F, block)
+
+
+def _cull(F: np.ndarray, block: int) -> np.ndarray:
+    """Exact cull behind ``non_dominated``.
+
+    Rows are visited in order of their scaled objective sum, so a row can only
+    be dominated by rows visited before it. Each step takes the next ``block``
+    rows, keeps those not dominated inside the block, and drops every
+    remaining row they dominate with one broadcast comparison. Work is
+    O(n * front size) instead of O(n^2).
+    """
+    # Sum of min-max scaled objectives so no single unit dominates the visit order
+    scale = np.ptp(F, axis=0)
+    scale[scale == 0] = 1.0
+    order = np.argsort(((F - F.min(axis=0)) / scale).sum(axis=1), kind="stable")
+    F = F[order]
+    candidates = np.arange(F.shape[0])
+    keep = []
+    while candidates.size:
+        head, candidates = candidates[:block], candidates[block:]
+        head = head[~_dominates(F[head], F[head]).any(axis=0)]
+        keep.append(head)
+        if candidates.size:
+            candidates = candidates[~_dominates(F[head], F[candidates]).any(axis=0)]
+    return order[np.concatenate(keep)]
+
+
+def thin(F: np.ndarray, max_points: int) -> np.ndarray:
+    """Pick up to ``max_points`` indices spread evenly along the cost axis."""
+    order = np.argsort(F[:, 0], kind="stable")
+    if order.size <= max_points:
+        return order
+    return order[np.linspace(0, order.size - 1, max_points).round().astype(np.intp)]
+
+
+def pareto_front(problem: OptimizationProblem, n_samples: int = 100000, seed: int = None,
+                 feasible_only: bool = True, max_points: int = 500) -> dict:
+    """Return the non-dominated setpoints trading cost against BS&W and salt."""
+    if not 1 <= n_samples <= MAX_SAMPLES:
+        raise ValueError(f"n_samples must be between 1 and {MAX_SAMPLES}")
+
+    start = time.perf_counter()
+    X = draw_candidates(problem, n_samples, np.random.default_rng(seed))
+    scored = problem.evaluate(X)
+    if feasible_only:
+        mask = scored["feasible"]
+        X = X[mask]
+        scored = {k: v[mask] for k, v in scored.items()}
+    F = np.column_stack([scored["cost"], scored["bsw"], scored["salt"]])
+
+    front = non_dominated(F)
+    shown = front[thin(F[front], max_points)] if front.size else front
+    elapsed = time.perf_counter() - start
+
+    return {
+        "objectives": list(OBJECTIVES),
+        "variables": list(VARIABLES),
+        "n_evaluations": n_samples,
+        "n_candidates": int(len(F)),
+        "front_size": int(front.size),
+        "points": [
+            {
+                "setpoints": {name: float(v) for name, v in zip(VARIABLES, X[i])},
+                "cost_per_bbl": float(F[i, 0]),
+                "bsw": float(F[i, 1]),
+                "salt": float(F[i, 2]),
+                "feasible": bool(scored["feasible"][i]),
+            }
+            for i in shown
+        ],
+        "elapsed_ms": elapsed * 1000.0,
+    }
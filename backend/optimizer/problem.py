@@ -0,0 +1,96 @@
+"""Optimization problem definition built from the ``desalterInputs`` payload."""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .cost import DEFAULT_TARIFFS, Tariffs, unit_cost
+from .model import DEFAULT_MODEL, VARIABLES, WASH, ResponseModel
+
+# Payload keys holding the lower/upper bound of each variable in VARIABLES
+RANGE_KEYS = (
+    ("flow_min", "flow_max"),
+    ("T_min", "T_max"),
+    ("V_min", "V_max"),
+    ("ppm_min", "ppm_max"),
+    ("wash_min", "wash_max"),
+)
+BASELINE_KEYS = (
+    "baseline_flow", "baseline_temp", "baseline_voltage",
+    "baseline_demulsifier", "baseline_wash",
+)
+
+INFEASIBLE_PENALTY = 1000.0   # added per unit of relative spec violation
+WASH_PRIORITY_WEIGHT = 0.05   # $/bbl per % wash when use_minimize_wash is set
+
+
+@dataclass
+class OptimizationProblem:
+    """Bounds, specs and objective for one desalter train."""
+
+    lower: np.ndarray
+    upper: np.ndarray
+    spec_bsw: float = 0.5
+    spec_salt: float = 5.0
+    minimize_wash: bool = False
+    baseline: np.ndarray = None
+    model: ResponseModel = field(default=DEFAULT_MODEL, repr=False)
+    tariffs: Tariffs = field(default=DEFAULT_TARIFFS, repr=False)
+
+    @classmethod
+    def from_inputs(cls, inputs: dict, model: ResponseModel = DEFAULT_MODEL) -> "OptimizationProblem":
+        """Build a problem from the ``desalterInputs`` dict stored by ``input.js``."""
+        lower = np.array([float(inputs[lo]) for lo, _ in RANGE_KEYS])
+        upper = np.array([float(inputs[hi]) for _, hi in RANGE_KEYS])
+        if np.any(lower >= upper):
+            bad = [VARIABLES[i] for i in np.flatnonzero(lower >= upper)]
+            raise ValueError(f"Range min must be less than max for: {', '.join(bad)}")
+        baseline = None
+        if all(k in inputs and inputs[k] is not None for k in BASELINE_KEYS):
+            baseline = np.array([float(inputs[k]) for k in BASELINE_KEYS])
+        return cls(
+            lower=lower,
+            upper=upper,
+            spec_bsw=float(inputs.get("spec_bsw", 0.5)),
+            spec_salt=float(inputs.get("spec_salt", 5.0)),
+            minimize_wash=bool(inputs.get("use_minimize_wash", False)),
+            baseline=baseline,
+            model=model,
+            tariffs=Tariffs.from_dict(inputs.get("tariffs")),
+        )
+
+    def evaluate(self, X: np.ndarray) -> dict:
+        """Score every row of ``X``; lower ``objective`` is better."""
+        X = np.asarray(X, dtype=np.float64)
+        bsw, salt = self.model.predict(X)
+        cost = unit_cost(X, self.tariffs)
+        violation = (np.maximum(bsw / self.spec_bsw - 1.0, 0.0)
+                     + np.maximum(salt / self.spec_salt - 1.0, 0.0))
+        objective = cost + INFEASIBLE_PENALTY * violation
+        if self.minimize_wash:
+            objective += WASH_PRIORITY_WEIGHT * X[:, WASH]
+        return {
+            "bsw": bsw,
+            "salt": salt,
+            "cost": cost,
+            "feasible": violation == 0.0,
+            "objective": objective,
+        }
+
+    def objective(self, X: np.ndarray) -> np.ndarray:
+        """Return only the objective array for the rows of ``X``."""
+        return self.evaluate(X)["objective"]
+
+
+def describe_point(problem: OptimizationProblem, x: np.ndarray) -> dict:
+    """Return setpoints and predictions for a single operating point."""
+    scored = problem.evaluate(np.asarray(x, dtype=np.float64)[None, :])
+    return {
+        "setpoints": {name: float(v) for name, v in zip(VARIABLES, x)},
+        "bsw": float(scored["bsw"][0]),
+        "salt": float(scored["salt"][0]),
+        "cost_per_bbl": float(scored["cost"][0]),
+        "bsw_within_spec": bool(scored["bsw"][0] <= problem.spec_bsw),
+        "salt_within_spec": bool(scored["salt"][0] <= problem.spec_salt),
+        "objective": float(scored["objective"][0]),
+    }
@@ -0,0 +1,57 @@
+"""Monte Carlo optimizer: score uniform batches of candidates at once."""
+
+import time
+
+import numpy as np
+
+from .problem import OptimizationProblem, describe_point
+
+MAX_SAMPLES = 2_000_000
+
+
+def draw_candidates(problem: OptimizationProblem, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw ``n_samples`` points uniformly inside the problem bounds."""
+    return rng.uniform(problem.lower, problem.upper, size=(n_samples, problem.lower.size))
+
+
+def optimize_sampling(problem: OptimizationProblem, n_samples: int = 3000, seed: int = None,
+                      progress=None, chunk_size: int = None) -> dict:
+    """Return the best of ``n_samples`` uniform candidates for ``problem``.
+
+    Candidates are scored in one batch unless ``chunk_size`` is given; with a
+    ``progress(phase, evaluated, total, best_objective)`` callback the batch
+    is split into about 20 chunks so progress can be reported. Chunking
+    draws the same random stream, so the result does not depend on it.
+    """
+    if not 1 <= n_samples <= MAX_SAMPLES:
+        raise ValueError(f"n_samples must be between 1 and {MAX_SAMPLES}")
+    if chunk_size is None:
+        chunk_size = max(-(-n_samples // 20), 16384) if progress else n_samples
+
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    best_x, best_objective, best_feasible = None, np.inf, False
+    n_feasible = 0
+    for offset in range(0, n_samples, chunk_size):
+        X = draw_candidates(problem, min(chunk_size, n_samples - offset), rng)
+        scored = problem.evaluate(X)
+        i = int(np.argmin(scored["objective"]))
+        if scored["objective"][i] < best_objective:
+            best_x, best_objective = X[i], float(scored["objective"][i])
+            best_feasible = bool(scored["feasible"][i])
+        n_feasible += int(scored["feasible"].sum())
+        if progress:
+            progress("sampling", offset + len(X), n_samples, best_objective)
+    elapsed = time.perf_counter() - start
+
+    result = describe_point(problem, best_x)
+    result.update({
+        "engine": "sampling",
+        "feasible": best_feasible,
+        "n_evaluations": n_samples,
+        "feasible_fraction": n_feasible / n_samples,
+        "elapsed_ms": elapsed * 1000.0,
+    })
+    if problem.baseline is not None:
+        result["baseline"] = describe_point(problem, problem.baseline)
+    return result
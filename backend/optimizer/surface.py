@@ -0,0 +1,80 @@
+"""Decision-map response surfaces over one pair of operating variables."""
+
+import struct
+
+import numpy as np
+
+from .cost import unit_cost
+from .model import VARIABLES
+from .problem import OptimizationProblem
+
+# Decision-map axis pairs from result.js, as (x variable, y variable)
+AXIS_PAIRS = {
+    "ppm_T": ("ppm", "T"),
+    "ppm_V": ("ppm", "V"),
+    "wash_T": ("wash", "T"),
+    "wash_V": ("wash", "V"),
+    "flow_wash": ("flow", "wash"),
+}
+LAYERS = ("bsw", "salt", "cost")
+
+# magic, version, nx, ny, n_layers, x_min, x_max, y_min, y_max, 4 pad bytes -> 32 bytes
+GRID_HEADER = struct.Struct("<4sHHHH4f4x")
+GRID_MAGIC = b"DSGR"
+GRID_VERSION = 1
+
+
+def response_grid(problem: OptimizationProblem, axes: str, resolution: int,
+                  fixed: dict = None, layers=("bsw", "salt")) -> dict:
+    """Evaluate ``layers`` on a ``resolution`` x ``resolution`` grid over ``axes``.
+
+    The two axis variables span the problem bounds; every other variable is
+    held at ``fixed`` or, failing that, the baseline (bounds midpoint without
+    one). Layers are ``(ny, nx)`` arrays, row 0 at ``y_min``.
+    """
+    if axes not in AXIS_PAIRS:
+        raise ValueError(f"Unknown axes {axes!r}; expected one of {', '.join(AXIS_PAIRS)}")
+    unknown = set(layers) - set(LAYERS)
+    if unknown:
+        raise ValueError(f"Unknown layers: {', '.join(sorted(unknown))}")
+    if resolution < 2:
+        raise ValueError("resolution must be at least 2")
+
+    xi, yi = (VARIABLES.index(v) for v in AXIS_PAIRS[axes])
+    anchor = problem.baseline if problem.baseline is not None else 0.5 * (problem.lower + problem.upper)
+    anchor = anchor.copy()
+    for name, value in (fixed or {}).items():
+        if name not in VARIABLES:
+            raise ValueError(f"Unknown variable {name!r}")
+        anchor[VARIABLES.index(name)] = float(value)
+
+    xs = np.linspace(problem.lower[xi], problem.upper[xi], resolution)
+    ys = np.linspace(problem.lower[yi], problem.upper[yi], resolution)
+    X = np.repeat(anchor[None, :], resolution * resolution, axis=0)
+    X[:, xi] = np.tile(xs, resolution)
+    X[:, yi] = np.repeat(ys, resolution)
+
+    values = {}
+    if "bsw" in layers or "salt" in layers:
+        values["bsw"], values["salt"] = problem.model.predict(X)
+    if "cost" in layers:
+        values["cost"] = unit_cost(X, problem.tariffs)
+
+    shape = (resolution, resolution)
+    return {
+        "axes": AXIS_PAIRS[axes],
+        "x": xs,
+        "y": ys,
+        "layers": {name: values[name].reshape(shape) for name in layers},
+    }
+
+
+def encode_grid(grid: dict) -> bytes:
+    """Pack a ``response_grid`` result as a 32-byte header plus little-endian float32 layers."""
+    xs, ys = grid["x"], grid["y"]
+    header = GRID_HEADER.pack(
+        GRID_MAGIC, GRID_VERSION, xs.size, ys.size, len(grid["layers"]),
+        xs[0], xs[-1], ys[0], ys[-1],
+    )
+    body = [np.ascontiguousarray(layer, dtype="<f4").tobytes() for layer in grid["layers"].values()]
+    return header + b"".join(body)
@@ -0,0 +1,99 @@
+"""Response model tabulated on a regular 5-D grid, with multilinear lookups.
+
+The table holds BS&W, salt and energy at every node of a grid over
+``VARIABLES`` as one float32 array of shape ``(*points, len(TABLE_OUTPUTS))``,
+saved as a plain ``.npy`` file so that a restart can memory-map it instead
+of rebuilding. A query gathers the ``2**5`` corners of each point's cell in
+one indexing operation and blends them with tensor-product weights.
+"""
+
+import hashlib
+import itertools
+
+import numpy as np
+
+from .cost import unit_energy
+from .model import VARIABLES, ResponseModel
+
+TABLE_OUTPUTS = ("bsw", "salt", "energy")
+BUILD_CHUNK = 1 << 18   # grid nodes evaluated per model call while building
+
+
+def table_key(model: ResponseModel, lower, upper, points) -> str:
+    """Digest of everything the table's values depend on.
+
+    Versions restart at 0 with every process, so the coefficients are
+    hashed along with the version number.
+    """
+    digest = hashlib.sha1()
+    for array in (model.bsw_coef, model.salt_coef, lower, upper, points):
+        digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    return f"v{model.version}-{digest.hexdigest()[:16]}"
+
+
+class ResponseTable:
+    """Grid values over ``[lower, upper]`` with ``points[d]`` nodes along variable ``d``."""
+
+    def __init__(self, lower, upper, values: np.ndarray):
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        self.values = values
+        self.points = np.array(values.shape[:-1], dtype=np.int64)
+        self.strides = np.array([int(np.prod(self.points[d + 1:])) for d in range(len(self.points))])
+        self.corners = np.array(list(itertools.product((0, 1), repeat=len(self.points)))) @ self.strides
+        self._flat = values.reshape(-1, values.shape[-1])
+
+    @classmethod
+    def build(cls, model: ResponseModel, lower, upper, points) -> "ResponseTable":
+        """Evaluate ``model`` and ``unit_energy`` at every grid node."""
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        points = [int(p) for p in points]
+        if len(points) != len(VARIABLES) or min(points) < 2:
+            raise ValueError(f"points must give at least 2 nodes for each of {', '.join(VARIABLES)}")
+        if np.any(lower >= upper):
+            raise ValueError("Table lower bounds must be less than the upper bounds")
+        axes = [np.linspace(lo, hi, n) for lo, hi, n in zip(lower, upper, points)]
+        values = np.empty((int(np.prod(points)), len(TABLE_OUTPUTS)), dtype=np.float32)
+        for offset in range(0, len(values), BUILD_CHUNK):
+            idx = np.unravel_index(np.arange(offset, min(offset + BUILD_CHUNK, len(values))), points)
+            X = np.column_stack([axis[i] for axis, i in zip(axes, idx)])
+            bsw, salt = model.predict(X)
+            values[offset:offset + len(X)] = np.column_stack([bsw, salt, unit_energy(X)])
+        return cls(lower, upper, values.reshape(*points, len(TABLE_OUTPUTS)))
+
+    def save(self, path):
+        """Write the values with the bounds as a ``(2, 5)`` array in a ``.bounds.npy`` sidecar."""
+        np.save(path, self.values)
+        np.save(bounds_path(path), np.vstack([self.lower, self.upper]))
+
+    @classmethod
+    def load(cls, path) -> "ResponseTable":
+        """Memory-map a table written by ``save``."""
+        lower, upper = np.load(bounds_path(path))
+        return cls(lower, upper, np.load(path, mmap_mode="r"))
+
+    def contains(self, X: np.ndarray) -> np.ndarray:
+        """Which rows of ``X`` lie inside the tabulated envelope."""
+        return np.all((X >= self.lower) & (X <= self.upper), axis=1)
+
+    def query(self, X: np.ndarray) -> dict:
+        """Interpolated ``TABLE_OUTPUTS`` for every row of ``X``; points outside are clamped to the envelope."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        n = len(X)
+        u = (np.clip(X, self.lower, self.upper) - self.lower) / (self.upper - self.lower) * (self.points - 1)
+        cell = np.minimum(u.astype(np.int64), self.points - 2)
+        frac = u - cell
+        weights = np.ones((n, 1))
+        for d in range(len(self.points)):
+            pair = np.column_stack([1.0 - frac[:, d], frac[:, d]])
+            weights = (weights[:, :, None] * pair[:, None, :]).reshape(n, -1)
+        corners = self._flat[(cell @ self.strides)[:, None] + self.corners]
+        values = np.einsum("nk,nkc->nc", weights, corners)
+        return {name: values[:, i] for i, name in enumerate(TABLE_OUTPUTS)}
+
+
+def bounds_path(path) -> str:
+    """Sidecar path holding the bounds of the table at ``path``."""
+    path = str(path)
+    return (path[:-4] if path.endswith(".npy") else path) + ".bounds.npy"
@@ -0,0 +1,165 @@
+"""Online retraining of the BS&W and salt response model.
+
+The response model is linear in its coefficients, so least squares can be
+carried forward in information form: ``A = sum w phi phi^T`` and
+``b = sum w phi y`` over every training row so far, with older rows
+down-weighted by a forgetting factor that halves every ``HALF_LIFE``
+seconds. A retrain folds in only the rows since the previous one, so its
+cost is proportional to the new data, then solves one small system for
+both outputs, regularised toward the shipped coefficients.
+
+New coefficients are published as a fresh immutable ``ResponseModel``
+through ``ModelRegistry``. Callers take ``current()`` once per request, so
+an optimization or what-if evaluation that started before a swap finishes
+on the model it began with.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from .optimizer import DEFAULT_MODEL, ResponseModel, features
+from .optimizer.model import FEATURE_NAMES
+from .whatif import SCENARIO_FIELDS
+
+OUTPUT_TAGS = ("bsw", "salt")
+HALF_LIFE = 7 * 86400.0  # seconds for a training row's weight to halve
+PRIOR_WEIGHT = 100.0     # pull toward the shipped coefficients, in rows' worth
+MAX_HOLD = 3600.0        # oldest setpoint reading paired with a BS&W sample, in seconds
+
+
+class ModelRegistry:
+    """The current response model; ``publish`` swaps in a new version atomically."""
+
+    def __init__(self, model: ResponseModel = DEFAULT_MODEL):
+        self._model = model
+        self._lock = threading.Lock()
+
+    def current(self) -> ResponseModel:
+        return self._model
+
+    def publish(self, bsw_coef: np.ndarray, salt_coef: np.ndarray, meta: dict) -> ResponseModel:
+        """Make a model from the coefficients the next version and return it."""
+        with self._lock:
+            model = ResponseModel(bsw_coef=bsw_coef, salt_coef=salt_coef,
+                                  version=self._model.version + 1, meta=meta)
+            self._model = model
+        return model
+
+
+def describe_model(model: ResponseModel) -> dict:
+    """JSON-ready coefficients of ``model`` by feature name."""
+    return {
+        "version": model.version,
+        "bsw_coef": dict(zip(FEATURE_NAMES, model.bsw_coef.tolist())),
+        "salt_coef": dict(zip(FEATURE_NAMES, model.salt_coef.tolist())),
+        **model.meta,
+    }
+
+
+def training_rows(historian, since: float):
+    """Pair every BS&W sample after ``since`` with the latest salt and setpoint readings.
+
+    Returns ``(X, Y, t, through)``: operating points, ``(bsw, salt)``
+    targets, sample times and the newest BS&W time looked at. Rows with a
+    missing or stale (older than ``MAX_HOLD``) reading are left out.
+    """
+    empty = np.empty((0, 5)), np.empty((0, 2)), np.empty(0)
+    try:
+        t, bsw = historian.range("bsw", since, None)
+    except KeyError:
+        return (*empty, since)
+    keep = t > since
+    t, bsw = t[keep], bsw[keep].astype(np.float64)
+    if len(t) == 0:
+        return (*empty, since)
+
+    columns, valid = [], np.isfinite(bsw) & (bsw > 0)
+    for tag in (*SCENARIO_FIELDS, "salt"):
+        try:
+            ts, vs = historian.range(tag, t[0] - MAX_HOLD, None)
+        except KeyError:
+            return (*empty, float(t[-1]))
+        idx = np.searchsorted(ts, t, side="right") - 1
+        held = idx >= 0
+        held[held] &= t[held] - ts[idx[held]] <= MAX_HOLD
+        values = np.where(held, vs[np.maximum(idx, 0)], np.nan).astype(np.float64)
+        valid &= np.isfinite(values)
+        columns.append(values)
+
+    X = np.column_stack(columns[:5])[valid]
+    Y = np.column_stack([bsw, columns[5]])[valid]
+    return X, Y, t[valid], float(t[-1])
+
+
+class RlsTrainer:
+    """Exponentially weighted least squares state feeding a ``ModelRegistry``."""
+
+    def __init__(self, registry: ModelRegistry, half_life: float = HALF_LIFE,
+                 prior_weight: float = PRIOR_WEIGHT):
+        self.registry = registry
+        self.half_life = half_life
+        base = registry.current()
+        n = len(FEATURE_NAMES)
+        self.prior_A = prior_weight * np.eye(n)
+        self.prior_b = self.prior_A @ np.column_stack([base.bsw_coef, base.salt_coef])
+        self.A = np.zeros((n, n))
+        self.b = np.zeros((n, 2))
+        self.weighted_at = None   # time the weights in A and b are relative to
+        self.through = -np.inf    # newest BS&W sample already folded in
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def fold(self, X: np.ndarray, Y: np.ndarray, t: np.ndarray):
+        """Add rows ``X -> Y`` observed at times ``t`` (ascending)."""
+        if len(t) == 0:
+            return
+        now = float(t[-1])
+        if self.weighted_at is not None:
+            decay = 0.5 ** ((now - self.weighted_at) / self.half_life)
+            self.A *= decay
+            self.b *= decay
+        phi = features(X)
+        weighted = phi * (0.5 ** ((now - t) / self.half_life))[:, None]
+        self.A += weighted.T @ phi
+        self.b += weighted.T @ Y
+        self.weighted_at = now
+        self.rows += len(t)
+
+    def solve(self) -> np.ndarray:
+        """Return the ``(n_features, 2)`` BS&W and salt coefficients."""
+        return np.linalg.solve(self.prior_A + self.A, self.prior_b + self.b)
+
+    def retrain(self, historian) -> dict:
+        """Fold in the rows ingested since the last retrain and publish a new model if there were any."""
+        with self._lock:
+            started = time.perf_counter()
+            X, Y, t, through = training_rows(historian, self.through)
+            self.through = max(self.through, through)
+            before = self.registry.current()
+            if len(t) == 0:
+                return {"published": False, "rows": 0, "rows_total": self.rows, "version": before.version}
+            self.fold(X, Y, t)
+            coef = self.solve()
+            model = self.registry.publish(coef[:, 0].copy(), coef[:, 1].copy(), {
+                "trained_at": time.time(),
+                "rows": int(len(t)),
+                "rows_total": self.rows,
+                "through": self.through,
+            })
+            rmse = {}
+            for name, m in (("before", before), ("after", model)):
+                bsw, salt = m.predict(X)
+                rmse[name] = {
+                    "bsw": float(np.sqrt(np.mean((bsw - Y[:, 0]) ** 2))),
+                    "salt": float(np.sqrt(np.mean((salt - Y[:, 1]) ** 2))),
+                }
+            return {
+                "published": True,
+                "rows": int(len(t)),
+                "rows_total": self.rows,
+                "version": model.version,
+                "rmse": rmse,
+                "elapsed_s": time.perf_counter() - started,
+            }
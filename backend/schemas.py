@@ -0,0 +1,196 @@
+"""Request bodies accepted by the backend API."""
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class OperatingRanges(BaseModel):
+    """Lower and upper bound of every decision variable, as configured on the input page."""
+
+    flow_min: float = 20000
+    flow_max: float = 60000
+    T_min: float = 105
+    T_max: float = 130
+    V_min: float = Field(50, gt=0)
+    V_max: float = 100
+    ppm_min: float = Field(10, ge=0)
+    ppm_max: float = 90
+    wash_min: float = Field(0.5, ge=0)
+    wash_max: float = 4.0
+
+
+class TariffSettings(BaseModel):
+    """Cost-model prices and plant constants; unset fields keep the backend defaults."""
+
+    demulsifier_price: Optional[float] = Field(None, ge=0)   # $/gal
+    heating_price: Optional[float] = Field(None, ge=0)       # $/kWh thermal
+    power_price: Optional[float] = Field(None, ge=0)         # $/kWh electric
+    wash_water_price: Optional[float] = Field(None, ge=0)    # $/bbl water
+    inlet_temp: Optional[float] = None                       # degC
+    heat_per_bbl_k: Optional[float] = Field(None, gt=0)      # kWh per bbl per K
+    power_factor: Optional[float] = Field(None, gt=0, le=1)
+    kva_per_volt: Optional[float] = Field(None, gt=0)
+    heater_efficiency: Optional[float] = Field(None, gt=0, le=1)
+
+
+class DesalterInputs(OperatingRanges):
+    """The ``desalterInputs`` payload saved by ``input.js`` (defaults match its Reset values)."""
+
+    spec_bsw: float = Field(0.5, gt=0)
+    spec_salt: float = Field(5.0, gt=0)
+    n_samples: int = Field(3000, ge=1)
+    use_minimize_wash: bool = False
+    baseline_flow: Optional[float] = 30000
+    baseline_demulsifier: Optional[float] = 70
+    baseline_temp: Optional[float] = 120
+    baseline_voltage: Optional[float] = 75
+    baseline_wash: Optional[float] = 2.0
+    seed: Optional[int] = None
+    engine: Literal["sampling", "local"] = "sampling"
+    n_starts: int = Field(8, ge=1, le=64)
+    tariffs: Optional[TariffSettings] = None
+
+
+class SensitivityRequest(OperatingRanges):
+    """Ranges and sample sizes for Sobol and Morris sensitivity; other payload fields are ignored."""
+
+    n_base: int = Field(8192, ge=64, le=65536)
+    n_trajectories: int = Field(500, ge=10, le=10000)
+    seed: int = 0
+
+
+class FleetUnit(DesalterInputs):
+    """One desalter train of a fleet: its own inputs and an optional display name."""
+
+    name: Optional[str] = None
+
+
+class FleetRequest(BaseModel):
+    """Trains to optimize together and an optional cap on their combined wash water (bbl/day)."""
+
+    units: List[FleetUnit] = Field(..., min_length=1, max_length=200)
+    wash_water_limit: Optional[float] = Field(None, gt=0)
+
+
+class ParetoRequest(DesalterInputs):
+    """Inputs for the cost vs BS&W vs salt Pareto front."""
+
+    feasible_only: bool = True
+    max_points: int = Field(500, ge=1, le=5000)
+
+
+class MapRequest(DesalterInputs):
+    """Decision-map axis pair, grid resolution and values for the other variables."""
+
+    axes: Literal["ppm_T", "ppm_V", "wash_T", "wash_V", "flow_wash"] = "ppm_T"
+    resolution: int = Field(256, ge=2, le=1024)
+    fixed: Optional[Dict[str, float]] = None
+
+
+class SurfaceRequest(MapRequest):
+    """Inputs for a decision-map response surface grid."""
+
+    layers: List[Literal["bsw", "salt", "cost"]] = ["bsw", "salt"]
+
+
+class ContourRequest(MapRequest):
+    """Inputs for decision-map spec boundaries and iso-cost lines."""
+
+    cost_levels: Optional[List[float]] = None
+    n_cost_levels: int = Field(4, ge=0, le=20)
+    tolerance: float = Field(0.002, ge=0, le=0.1)
+
+
+class Scenario(BaseModel):
+    """One what-if slider combination."""
+
+    ppm: float = Field(..., ge=0)
+    temp: float
+    voltage: float = Field(..., gt=0)
+    wash: float = Field(..., ge=0)
+    flow: float = Field(..., gt=0)
+
+
+class WhatIfBatchRequest(BaseModel):
+    """Scenarios to evaluate against a reference point (the input-page baseline by default)."""
+
+    scenarios: List[Scenario] = Field(..., max_length=200_000)
+    reference: Scenario = Scenario(ppm=70, temp=120, voltage=75, wash=2.0, flow=30000)
+    spec_bsw: float = Field(0.5, gt=0)
+    spec_salt: float = Field(5.0, gt=0)
+    tariffs: Optional[TariffSettings] = None
+
+
+class TableQueryRequest(BaseModel):
+    """Operating points to look up in the current model's response table."""
+
+    points: List[Scenario] = Field(..., min_length=1, max_length=200_000)
+
+
+class CostRequest(BaseModel):
+    """Operating points to cost under the given tariffs (the defaults when omitted)."""
+
+    points: List[Scenario] = Field(..., min_length=1, max_length=200_000)
+    tariffs: Optional[TariffSettings] = None
+
+
+class WhatIfSessionRequest(BaseModel):
+    """Slider values that changed since the session's previous request (all five on the first)."""
+
+    flow: Optional[float] = Field(None, gt=0)
+    temp: Optional[float] = None
+    voltage: Optional[float] = Field(None, gt=0)
+    ppm: Optional[float] = Field(None, ge=0)
+    wash: Optional[float] = Field(None, ge=0)
+    spec_bsw: float = Field(0.5, gt=0)
+    spec_salt: float = Field(5.0, gt=0)
+
+
+class TagSeries(BaseModel):
+    """Samples for one tag: Unix-second timestamps and values of equal length."""
+
+    t: List[float]
+    v: List[float]
+
+
+class IngestRequest(BaseModel):
+    """Historian samples keyed by tag name."""
+
+    series: Dict[str, TagSeries]
+
+
+class BreachRequest(BaseModel):
+    """Operating point (the live tag values when omitted) and uncertainty for the breach forecast."""
+
+    point: Optional[Scenario] = None
+    spec_bsw: float = Field(0.5, gt=0)
+    spec_salt: float = Field(5.0, gt=0)
+    horizon_hours: float = Field(24.0, gt=0, le=168)
+    step_minutes: float = Field(15.0, ge=1)
+    n_draws: int = Field(2000, ge=1, le=100_000)
+    drift: Optional[Dict[str, float]] = None
+    measurement_sd: Optional[Dict[str, float]] = None
+    drift_sd: Optional[Dict[str, float]] = None
+    seed: Optional[int] = None
+
+
+class AssetSpec(BaseModel):
+    """Metadata of one maintained asset; fields left out keep their current value."""
+
+    id: str
+    name: Optional[str] = None
+    area: Optional[str] = None
+    kind: Optional[str] = None
+    impact: Optional[str] = None
+    rated_load: Optional[float] = Field(None, gt=0)
+
+
+class AssetRegisterRequest(BaseModel):
+    assets: List[AssetSpec] = Field(..., max_length=100_000)
+
+
+class AssetIngestRequest(BaseModel):
+    """Asset samples keyed by asset id, then by signal (``fouling``, ``dp``, ``load``)."""
+
+    samples: Dict[str, Dict[str, TagSeries]]
@@ -0,0 +1,114 @@
+"""Disk cache of response tables, one per model version.
+
+Tables cover ``ENVELOPE``, which spans both the input-page ranges and the
+what-if sliders. Every build is written to a new
+``<directory>/<table_key>-<build>.npy`` (values) and ``.bounds.npy``
+(bounds) through temporary files renamed into place, so a crashed build
+never leaves a file that a later start would memory-map, and no file that
+may still be mapped is ever overwritten. Files of tables outside the
+``MAX_OPEN`` in use are deleted once nothing here maps them; a file still
+locked by a reader (Windows refuses to delete mapped files) is retried on
+the next load. A restart with the same coefficients reuses the newest build.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from .optimizer import VARIABLES, ResponseModel
+from .optimizer.table import TABLE_OUTPUTS, ResponseTable, bounds_path, table_key
+
+# Lower and upper bound of each variable in VARIABLES order
+ENVELOPE = ((10000.0, 100000.0), (80.0, 140.0), (20.0, 100.0), (0.0, 100.0), (0.0, 10.0))
+DEFAULT_POINTS = 13     # nodes per variable, about 4.5 MB for three float32 outputs
+MAX_OPEN = 2            # tables kept mapped and on disk, most recently used first
+
+
+class TableStore:
+    """Builds, persists and memory-maps the response table of each model version."""
+
+    def __init__(self, directory, points=DEFAULT_POINTS, envelope=ENVELOPE):
+        self.directory = Path(directory)
+        self.points = np.broadcast_to(np.asarray(points, dtype=np.int64), (len(VARIABLES),)).copy()
+        self.lower = np.array([lo for lo, _ in envelope], dtype=np.float64)
+        self.upper = np.array([hi for _, hi in envelope], dtype=np.float64)
+        self._open = OrderedDict()   # key -> (table, info)
+        self._lock = threading.Lock()
+
+    def key(self, model: ResponseModel) -> str:
+        return table_key(model, self.lower, self.upper, self.points)
+
+    def _newest(self, key: str):
+        """Path of the newest complete build of ``key`` on disk, or ``None``."""
+        builds = []
+        for path in self.directory.glob(f"{key}-*.npy"):
+            build = path.name[len(key) + 1:-len(".npy")]
+            if build.isdigit() and os.path.exists(bounds_path(path)):
+                builds.append((int(build), path))
+        return max(builds)[1] if builds else None
+
+    def get(self, model: ResponseModel, rebuild: bool = False):
+        """Return ``(table, info)`` for ``model``, mapping the file on disk or building it first."""
+        key = self.key(model)
+        with self._lock:
+            if not rebuild and key in self._open:
+                self._open.move_to_end(key)
+                return self._open[key]
+            started = time.perf_counter()
+            source = "disk"
+            path = None if rebuild else self._newest(key)
+            if path is None:
+                path = self._build(model, key)
+                source = "built"
+            table = ResponseTable.load(path)
+            info = {
+                "model_version": model.version,
+                "path": str(path),
+                "source": source,
+                "outputs": list(TABLE_OUTPUTS),
+                "points": dict(zip(VARIABLES, self.points.tolist())),
+                "lower": dict(zip(VARIABLES, self.lower.tolist())),
+                "upper": dict(zip(VARIABLES, self.upper.tolist())),
+                "bytes": int(table.values.nbytes),
+                "ready_ms": (time.perf_counter() - started) * 1000.0,
+            }
+            self._open[key] = (table, info)
+            self._open.move_to_end(key)
+            while len(self._open) > MAX_OPEN:
+                # Drop this store's mapping first so the file can be deleted
+                self._open.popitem(last=False)
+            self._prune()
+            return table, info
+
+    def _prune(self):
+        """Delete table files not in ``_open``, from this run or earlier ones; caller holds the lock.
+
+        On Windows a file still mapped by a request in flight cannot be
+        deleted; it is left for the next prune.
+        """
+        keep = {Path(info["path"]).name for _, info in self._open.values()}
+        for path in self.directory.glob("v*-*.npy"):
+            if path.name.endswith(".tmp.npy"):
+                continue
+            name = path.name[:-len(".bounds.npy")] + ".npy" if path.name.endswith(".bounds.npy") else path.name
+            if name not in keep:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _build(self, model: ResponseModel, key: str) -> Path:
+        """Write a new build of ``model``'s table under a name no reader has mapped; returns its path."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = ResponseTable.build(model, self.lower, self.upper, self.points)
+        path = self.directory / f"{key}-{time.time_ns()}.npy"
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        table.save(tmp)
+        # Bounds first: the values file appearing is what marks the table complete
+        os.replace(bounds_path(tmp), bounds_path(path))
+        os.replace(tmp, path)
+        return path
@@ -0,0 +1,201 @@
+"""What-if scenario evaluation against a reference operating point."""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .optimizer import DEFAULT_MODEL, DEFAULT_TARIFFS, VARIABLES, ResponseModel, Tariffs, unit_cost
+from .optimizer.model import BSW_FLOOR, SALT_FLOOR
+
+# Scenario field names in optimizer.VARIABLES order
+SCENARIO_FIELDS = ("flow", "temp", "voltage", "ppm", "wash")
+# Slider ranges of the what-if panel in result.html, in SCENARIO_FIELDS order
+SLIDER_RANGES = ((10000.0, 100000.0), (80.0, 140.0), (20.0, 35.0), (0.0, 100.0), (0.0, 10.0))
+
+# Relative (log-scale) model uncertainty used to turn predictions into breach risk
+BSW_RSD = 0.12
+SALT_RSD = 0.10
+
+
+def norm_cdf(z: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)."""
+    z = np.asarray(z, dtype=np.float64)
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def breach_risk(bsw: np.ndarray, salt: np.ndarray, spec_bsw: float, spec_salt: float) -> np.ndarray:
+    """Probability that BS&W or salt exceeds spec given the model's relative uncertainty."""
+    p_bsw = norm_cdf(np.log(bsw / spec_bsw) / BSW_RSD)
+    p_salt = norm_cdf(np.log(salt / spec_salt) / SALT_RSD)
+    return 1.0 - (1.0 - p_bsw) * (1.0 - p_salt)
+
+
+def evaluate_scenarios(X: np.ndarray, reference: np.ndarray, spec_bsw: float, spec_salt: float,
+                       model: ResponseModel = DEFAULT_MODEL, tariffs: Tariffs = DEFAULT_TARIFFS) -> dict:
+    """Score every row of ``X`` against ``reference`` in one vectorized pass.
+
+    Rows of ``X`` follow ``optimizer.VARIABLES``; ``reference`` is appended as
+    the last row so it shares the same evaluation call.
+    """
+    points = np.vstack([np.asarray(X, dtype=np.float64), np.asarray(reference, dtype=np.float64)[None, :]])
+    bsw, salt = model.predict(points)
+    cost = unit_cost(points, tariffs)
+    risk = breach_risk(bsw, salt, spec_bsw, spec_salt)
+
+    ref_bsw, ref_salt, ref_cost, ref_risk = bsw[-1], salt[-1], cost[-1], risk[-1]
+    bsw, salt, cost, risk = bsw[:-1], salt[:-1], cost[:-1], risk[:-1]
+    return {
+        "n_scenarios": int(len(bsw)),
+        "reference": {
+            "bsw": float(ref_bsw),
+            "salt": float(ref_salt),
+            "cost_per_bbl": float(ref_cost),
+            "breach_risk": float(ref_risk),
+        },
+        "bsw": bsw.tolist(),
+        "salt": salt.tolist(),
+        "bsw_change": (bsw - ref_bsw).tolist(),
+        "salt_change": (salt - ref_salt).tolist(),
+        "cost_per_bbl": cost.tolist(),
+        "breach_risk": risk.tolist(),
+        # Percentage points; positive means more likely to breach than the reference
+        "breach_risk_delta": ((risk - ref_risk) * 100.0).tolist(),
+        # Percent cost-per-barrel saving; positive means more efficient than the reference
+        "efficiency_impact": ((ref_cost - cost) / ref_cost * 100.0).tolist(),
+    }
+
+
+def scenario_points(scenarios) -> np.ndarray:
+    """Convert scenario objects with ``SCENARIO_FIELDS`` attributes to an ``(n, 5)`` array."""
+    rows = [[getattr(s, name) for name in SCENARIO_FIELDS] for s in scenarios]
+    return np.array(rows, dtype=np.float64).reshape(-1, 5)
+
+
+class Superseded(Exception):
+    """Raised when a newer request from the same session overtook this one."""
+
+
+class WhatIfSession:
+    """Slider state of one what-if panel with cached per-variable model terms.
+
+    The response model is additive across variables, so each variable's
+    BS&W/salt contribution at the current slider value is kept, together with
+    its contribution along the whole slider range (which no other variable
+    affects). Moving one slider recomputes only that variable's term; the
+    other curves are shifted by the new totals.
+    """
+
+    def __init__(self, curve_points: int = 51):
+        self.curve_points = curve_points
+        self.grids = [np.linspace(lo, hi, curve_points) for lo, hi in SLIDER_RANGES]
+        self.values = np.full(len(VARIABLES), np.nan)
+        self.terms = np.zeros((len(VARIABLES), 2))
+        self.curves = {}
+        self.model = None
+        self.last_used = time.monotonic()
+        self.terms_recomputed = 0
+        self.requests = 0
+        self._latest = 0
+        self._ticket_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _check(self, ticket: int):
+        """Abort when a newer request has been issued for this session."""
+        if ticket != self._latest:
+            raise Superseded(f"superseded by request {self._latest}")
+
+    def evaluate(self, updates: dict, spec_bsw: float, spec_salt: float,
+                 model: ResponseModel = DEFAULT_MODEL) -> dict:
+        """Apply slider ``updates`` (``SCENARIO_FIELDS`` keys) and return predictions and curves."""
+        with self._ticket_lock:
+            self._latest += 1
+            ticket = self._latest
+
+        with self._lock:
+            self.last_used = time.monotonic()
+            self.requests += 1
+            if model is not self.model:
+                # A retrain swapped the model: keep the sliders, redo every term and curve with it
+                for var in np.flatnonzero(~np.isnan(self.values)):
+                    self.terms[var] = model.partial(var, self.values[var:var + 1])[0]
+                    self.terms_recomputed += 1
+                self.curves.clear()
+                self.model = model
+
+            new = self.values.copy()
+            for name, value in updates.items():
+                if value is not None:
+                    new[SCENARIO_FIELDS.index(name)] = float(value)
+            if np.isnan(new).any():
+                missing = [SCENARIO_FIELDS[i] for i in np.flatnonzero(np.isnan(new))]
+                raise ValueError(f"First request of a session must set: {', '.join(missing)}")
+
+            # Updates are always applied: the client sends each changed slider only once
+            changed = np.flatnonzero(new != self.values)
+            for var in changed:
+                self.terms[var] = model.partial(var, new[var:var + 1])[0]
+                self.values[var] = new[var]
+                self.terms_recomputed += 1
+            # Only the response is skipped when a newer request is already waiting
+            self._check(ticket)
+            for var in range(len(VARIABLES)):
+                if var not in self.curves:
+                    self.curves[var] = model.partial(var, self.grids[var])
+
+            floor = np.array([BSW_FLOOR, SALT_FLOOR])
+            total = model.bias() + self.terms.sum(axis=0)
+            bsw, salt = np.maximum(total, floor)
+            risk = float(breach_risk(np.array([bsw]), np.array([salt]), spec_bsw, spec_salt)[0])
+            curves = {}
+            for var, name in enumerate(SCENARIO_FIELDS):
+                along = np.maximum(total - self.terms[var] + self.curves[var], floor)
+                curves[name] = {"x": self.grids[var].tolist(), "bsw": along[:, 0].tolist(), "salt": along[:, 1].tolist()}
+
+            return {
+                "request": ticket,
+                "values": dict(zip(SCENARIO_FIELDS, self.values.tolist())),
+                "changed": [SCENARIO_FIELDS[i] for i in changed],
+                "bsw": float(bsw),
+                "salt": float(salt),
+                "cost_per_bbl": float(unit_cost(self.values[None, :])[0]),
+                "breach_risk": risk,
+                "curves": curves,
+            }
+
+
+class SessionRegistry:
+    """What-if sessions by id, dropping idle ones and the least recently used beyond a cap."""
+
+    def __init__(self, max_sessions: int = 256, idle_timeout: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> WhatIfSession:
+        """Return the session for ``session_id``, creating it if needed."""
+        now = time.monotonic()
+        with self._lock:
+            for sid in [sid for sid, s in self._sessions.items() if now - s.last_used > self.idle_timeout]:
+                del self._sessions[sid]
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = WhatIfSession()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """Forget ``session_id``; returns whether it existed."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
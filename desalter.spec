@@ -134,6 +134,8 @@ a = Analysis(
 
         # Other dependencies
         'backend.main',
+        'backend.optimizer',
+        'numpy',
         'webbrowser',
         'pathlib',
         'pathlib.Path',
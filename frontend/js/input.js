@@ -141,7 +141,65 @@ $('startBtn').addEventListener('click', async () => {
   // Persist for later pages
   localStorage.setItem('desalterInputs', JSON.stringify(params));
 
-  // Simulate processing time with multiple stages
+  // Follow the real optimizer when the backend is available, otherwise fall back to the timed demo
+  const started = await runOptimizationJob(params);
+  if (!started) runSimulatedProgress();
+});
+
+// Submit the optimization job and drive the overlay from its Server-Sent Events
+async function runOptimizationJob(params) {
+  let job;
+  try {
+    const res = await fetch('/api/optimize/jobs', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(params)
+    });
+    if (!res.ok) return false;
+    job = await res.json();
+  } catch {
+    return false;
+  }
+
+  const events = new EventSource(job.events);
+  events.addEventListener('progress', (e) => {
+    const p = JSON.parse(e.data);
+    if (p.phase === 'validating') {
+      updateProgressStep(1);
+      return;
+    }
+    updateProgressStep(p.evaluated >= p.total ? 3 : 2);
+    const subtitleElement = document.querySelector('.progress-subtitle');
+    if (subtitleElement && p.total) {
+      const unit = p.phase === 'searching' ? 'starts' : 'samples';
+      subtitleElement.textContent = `${fmt(p.evaluated)} / ${fmt(p.total)} ${unit} evaluated`;
+    }
+  });
+  events.addEventListener('done', () => {
+    events.close();
+    updateProgressStep(4);
+    window.location.href = '/results';
+  });
+  events.addEventListener('failed', (e) => {
+    events.close();
+    hideLoadingOverlay();
+    showError(JSON.parse(e.data).error || 'Optimization failed.');
+  });
+  events.addEventListener('cancelled', () => {
+    events.close();
+    hideLoadingOverlay();
+    showError('Optimization was cancelled.');
+  });
+  events.onerror = () => {
+    events.close();
+    hideLoadingOverlay();
+    showError('Lost connection to the optimizer.');
+  };
+  return true;
+}
+
+// Timed progress used when no backend is available (static hosting)
+function runSimulatedProgress() {
   setTimeout(() => {
     updateProgressStep(1);
   }, 1000);
@@ -161,7 +219,7 @@ $('startBtn').addEventListener('click', async () => {
       showResultsPage();
     }, 1500);
   }, 5500);
-});
+}
 
 // Loading overlay functions
 function showLoadingOverlay() {
@@ -169,7 +169,100 @@ function tick(){
   document.getElementById('lastUpdate').textContent = 'Just now';
 }
 tick();
-setInterval(tick, 1800);
+let demoTicker = setInterval(tick, 1800);
+
+// --- Live values pushed by the backend (only tags that changed) ---
+const LIVE_FIELDS = {
+  flow:    [['flowBpd', v => Math.round(v).toLocaleString()]],
+  bsw:     [['bswValue', v => v.toFixed(2)], ['bswDetail', v => v.toFixed(2)]],
+  salt:    [['saltPtb', v => v.toFixed(2)], ['saltDetail', v => v.toFixed(2)]],
+  temp:    [['tempValue', v => v.toFixed(1)]],
+  voltage: [['voltageValue', v => v.toFixed(1)]],
+  ppm:     [['ppmValue', v => v.toFixed(1)]],
+  energy:  [['enNow', v => v.toFixed(0)]]
+};
+let liveVersion = 0;
+let kpisShown = false;
+
+function applyLiveValues(values){
+  let shown = false;
+  for (const [tag, sample] of Object.entries(values)) {
+    for (const [id, format] of LIVE_FIELDS[tag] || []) {
+      const el = document.getElementById(id);
+      if (el) { el.textContent = format(sample.v); shown = true; }
+    }
+  }
+  if (shown) {
+    // Real data is flowing: stop the random demo numbers
+    if (demoTicker) { clearInterval(demoTicker); demoTicker = null; }
+    document.getElementById('lastUpdate').textContent = 'Just now';
+    if (!kpisShown) { kpisShown = true; refreshKpis(); }
+  }
+}
+
+function startLiveFeed(){
+  if (typeof EventSource === 'undefined') return;
+  const source = new EventSource('/api/live/events');
+  const onValues = (e) => {
+    const data = JSON.parse(e.data);
+    liveVersion = data.version;
+    applyLiveValues(data.values);
+  };
+  source.addEventListener('snapshot', onValues);
+  source.addEventListener('values', onValues);
+}
+startLiveFeed();
+
+// Throughput, energy and uptime from the backend's rolling-window aggregates
+async function refreshKpis(){
+  if (demoTicker) return;
+  try {
+    const res = await fetch('/api/kpi?tags=flow,energy');
+    if (!res.ok) return;
+    const kpi = await res.json();
+    const flow = kpi.flow && kpi.flow.windows;
+    const energy = kpi.energy && kpi.energy.windows;
+    const set = (id, value, format) => {
+      const el = document.getElementById(id);
+      if (el && value !== null && value !== undefined) el.textContent = format(value);
+    };
+    if (flow) {
+      // flow is in BPD, the panel shows bbl/hr
+      set('tpNow', flow['1m'].mean, v => (v / 24).toFixed(0));
+      set('tpAvg', flow['24h'].mean, v => (v / 24).toFixed(0));
+      set('uptime', flow['24h'].uptime, v => (v * 100).toFixed(1) + '%');
+    }
+    if (energy) {
+      set('enNow', energy['1m'].mean, v => v.toFixed(0));
+      set('enAvg', energy['24h'].mean, v => v.toFixed(0));
+      set('enPeak', energy['24h'].max, v => v.toFixed(0));
+    }
+  } catch (err) {
+    console.warn('KPI refresh failed:', err);
+  }
+}
+setInterval(refreshKpis, 5000);
+
+// Drift and spike alerts from the backend's anomaly detectors
+const ALERT_TEXT = { spike: 'spike', drift_up: 'drifting up', drift_down: 'drifting down' };
+
+function showAlerts(alerts){
+  for (const alert of alerts) {
+    toast(`⚠️ ${alert.tag.toUpperCase()} ${ALERT_TEXT[alert.kind] || alert.kind} (z = ${alert.z.toFixed(1)})`);
+    if ((alert.tag === 'bsw' || alert.tag === 'salt') && alert.kind === 'drift_up') {
+      const card = document.querySelector(alert.tag === 'bsw' ? '.bsw-breach .breach-icon' : '.salt-breach .breach-icon');
+      if (card) card.textContent = '⚠️';
+    }
+  }
+}
+
+function startAlertFeed(){
+  if (typeof EventSource === 'undefined') return;
+  const source = new EventSource('/api/alerts/events');
+  // The snapshot replays recent alerts; only new ones are announced
+  source.addEventListener('alerts', (e) => showAlerts(JSON.parse(e.data).alerts));
+}
+startAlertFeed();
 
 // ===== Process Parameter Relationship Charts =====
 
@@ -917,7 +1010,11 @@ function setupAutoRefresh() {
 
     if (autoRefreshCheckbox.checked) {
       const interval = parseInt(refreshIntervalSelect.value);
+      let drawnVersion = liveVersion;
       chartRefreshInterval = setInterval(() => {
+        // With live data, redraw only when the backend pushed something new
+        if (!demoTicker && liveVersion === drawnVersion) return;
+        drawnVersion = liveVersion;
         initializeAdvancedCharts();
       }, interval);
     }
@@ -951,10 +1048,97 @@ function initializePredictiveMaintenance() {
   // Update maintenance calendar
   updateMaintenanceCalendar();
 
+  // Replace the sample rows with the server's asset health once the fleet has assets
+  refreshAssetHealth();
+
   // Add real-time updates
   setInterval(updateMaintenanceMetrics, 30000); // Update every 30 seconds
 }
 
+// Server-side asset health (GET /api/assets); null while the fleet is empty
+const ASSET_PAGE_SIZE = 50;
+const assetQuery = { filter: 'all', page: 1 };
+let assetSummary = null;
+
+async function refreshAssetHealth() {
+  const params = new URLSearchParams({ page: assetQuery.page, page_size: ASSET_PAGE_SIZE });
+  if (assetQuery.filter === 'critical') {
+    params.set('risk', 'high');
+  } else if (assetQuery.filter === 'maintenance') {
+    params.set('due_within', 30);
+    params.set('sort', 'days_to_action');
+  }
+  try {
+    const res = await fetch(`/api/assets?${params}`);
+    if (!res.ok) return;
+    const listing = await res.json();
+    if (!listing.summary.assets) return;
+    assetSummary = listing.summary;
+    renderAssetRows(listing);
+    updateOverallHealth();
+    drawFoulingChart();
+  } catch (err) {
+    console.warn('Asset health refresh failed:', err);
+  }
+}
+
+function changeAssetPage(delta) {
+  assetQuery.page = Math.max(1, assetQuery.page + delta);
+  refreshAssetHealth();
+}
+
+function escapeHtml(text) {
+  return String(text).replace(/[&<>"']/g, ch => ({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+  })[ch]);
+}
+
+// Render one page of the listing into the asset table
+function renderAssetRows(listing) {
+  const tbody = document.querySelector('.asset-health-table tbody');
+  if (!tbody) return;
+
+  const RISK_TEXT = { low: 'Normal', medium: 'Medium', high: 'High' };
+  const ACTIONS = { low: ['Monitor', ''], medium: ['Service', ' urgent'], high: ['Replace', ' urgent'] };
+  const RISK_COLORS = { low: '#10b981', medium: '#f59e0b', high: '#ef4444' };
+
+  tbody.innerHTML = listing.items.map((asset, index) => {
+    const scoreClass = asset.health >= 50 ? 'ok' : asset.health >= 25 ? 'warn' : 'danger';
+    const days = asset.days_to_action === null ? '—' : `${Math.round(asset.days_to_action)} days`;
+    const [action, urgent] = ACTIONS[asset.risk];
+    return `<tr>
+      <td>${escapeHtml(asset.name)}</td>
+      <td>${escapeHtml(asset.area)}</td>
+      <td><span class="health-score ${scoreClass}">${Math.round(asset.health)}</span></td>
+      <td><span class="risk-badge ${asset.risk}">${RISK_TEXT[asset.risk]}</span></td>
+      <td>${escapeHtml(asset.impact)}</td>
+      <td>${escapeHtml(asset.failure_mode)}</td>
+      <td>${days}</td>
+      <td><canvas class="trend-sparkline" id="assetSpark${index}" width="60" height="20"></canvas></td>
+      <td><button class="btn-xs action-btn${urgent}">${action}</button></td>
+    </tr>`;
+  }).join('');
+
+  // Sparkline: the fitted fouling trend over the last week
+  listing.items.forEach((asset, index) => {
+    if (asset.fouling_level === null) return;
+    const slope = asset.fouling_slope || 0;
+    const data = [6, 5, 4, 3, 2, 1, 0].map(daysAgo => asset.fouling_level - slope * daysAgo);
+    drawSparkline(`assetSpark${index}`, data, RISK_COLORS[asset.risk]);
+  });
+
+  const pager = document.getElementById('assetPager');
+  if (pager) {
+    const first = listing.total ? (listing.page - 1) * listing.page_size + 1 : 0;
+    const last = Math.min(listing.total, listing.page * listing.page_size);
+    pager.style.display = 'flex';
+    document.getElementById('assetPagerInfo').textContent =
+      `${first}–${last} of ${listing.total.toLocaleString()} assets`;
+    document.getElementById('assetPrev').disabled = listing.page <= 1;
+    document.getElementById('assetNext').disabled = last >= listing.total;
+  }
+}
+
 
 // Draw fouling risk chart
 function drawFoulingChart() {
@@ -965,8 +1149,11 @@ function drawFoulingChart() {
   const width = canvas.width;
   const height = canvas.height;
 
-  // Sample fouling risk data over time
-  const data = [65, 68, 72, 75, 78, 82, 78, 85, 88, 85, 90, 87, 92, 89, 94];
+  // Fleet mean fouling index per hour from the server, else sample data
+  const history = assetSummary ? assetSummary.fouling_history : [];
+  const data = history.length >= 2
+    ? history.map(point => point.fouling)
+    : [65, 68, 72, 75, 78, 82, 78, 85, 88, 85, 90, 87, 92, 89, 94];
 
   ctx.clearRect(0, 0, width, height);
 
@@ -1021,8 +1208,15 @@ function initializeAssetFilter() {
   });
 }
 
-// Filter assets based on selected criteria
+// Filter assets based on selected criteria (on the server once the fleet has assets)
 function filterAssets(filter) {
+  if (assetSummary) {
+    assetQuery.filter = filter;
+    assetQuery.page = 1;
+    refreshAssetHealth();
+    return;
+  }
+
   const rows = document.querySelectorAll('.asset-health-table tbody tr');
 
   rows.forEach(row => {
@@ -1054,8 +1248,17 @@ function filterAssets(filter) {
 
 // Update overall health score
 function updateOverallHealth() {
-  const scores = [71, 89, 23, 56, 34, 28, 19, 67]; // Component scores
-  const avgScore = scores.reduce((a, b) => a + b, 0) / scores.length;
+  const scores = [71, 89, 23, 56, 34, 28, 19, 67]; // Sample component scores
+  const avgScore = assetSummary
+    ? assetSummary.mean_health
+    : scores.reduce((a, b) => a + b, 0) / scores.length;
+
+  if (assetSummary) {
+    const critical = document.getElementById('criticalCount');
+    if (critical) critical.textContent = assetSummary.by_risk.high;
+    const risk = document.getElementById('downtimeRisk');
+    if (risk) risk.textContent = Math.round(100 * assetSummary.by_risk.high / assetSummary.assets) + '%';
+  }
 
   const scoreElement = document.getElementById('overallScore');
   if (scoreElement) {
@@ -1081,8 +1284,13 @@ function updateOverallHealth() {
   }
 }
 
-// Update maintenance metrics with random variations
+// Update maintenance metrics from the server, or with random variations on the sample data
 function updateMaintenanceMetrics() {
+  if (assetSummary) {
+    refreshAssetHealth();
+    return;
+  }
+
   // Update component scores with small random variations
   const components = [
     'electrodeResistance', 'electrodeFouling', 'electrodeETA',
@@ -1397,6 +1605,41 @@ function calculateOptimizationResults() {
   console.log('Calculated optimization results:', calculationResults);
 }
 
+// Replace the local estimate with the server-side optimizer result when the backend is reachable
+async function fetchOptimizationResults() {
+  if (!userInputs.rawInputs) return false;
+  try {
+    const res = await fetch('/api/optimize', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(userInputs.rawInputs)
+    });
+    if (!res.ok) return false;
+    const opt = await res.json();
+
+    calculationResults.bsw = opt.bsw;
+    calculationResults.salt = opt.salt;
+    calculationResults.bswWithinSpec = opt.bsw_within_spec;
+    calculationResults.saltWithinSpec = opt.salt_within_spec;
+    calculationResults.optimizedPPM = Math.round(opt.setpoints.ppm);
+    calculationResults.optimizedTemp = Math.round(opt.setpoints.T);
+    calculationResults.optimizedVoltage = Math.round(opt.setpoints.V);
+    calculationResults.optimizedWash = opt.setpoints.wash;
+    if (opt.baseline) {
+      calculationResults.baselineBSW = opt.baseline.bsw;
+      calculationResults.baselineSalt = opt.baseline.salt;
+    }
+    calculationResults.bswImprovement = ((calculationResults.baselineBSW - calculationResults.bsw) / calculationResults.baselineBSW) * 100;
+    calculationResults.saltImprovement = ((calculationResults.baselineSalt - calculationResults.salt) / calculationResults.baselineSalt) * 100;
+
+    console.log('Server optimization results:', opt);
+    return true;
+  } catch (e) {
+    console.warn('Optimizer API unavailable, keeping local estimate:', e);
+    return false;
+  }
+}
+
 // Update optimization panel with calculated results
 function updateOptimizationPanel() {
   // Update primary KPIs
@@ -1528,6 +1771,7 @@ function updateDecisionMap() {
   };
 
   const currentAxes = state.axes || 'ppm_T';
+  if (!costSlopes || costSlopes.axes !== currentAxes) refreshOperatingCost();
   const title = `Decision Map — ${axisNames[currentAxes][0]} × ${axisNames[currentAxes][1]} → BS&W`;
   updateElement('chartTitle', title);
 
@@ -1559,8 +1803,9 @@ function updateDecisionMap() {
       return Math.max(0.05, Math.min(1.0, baseSalt + ppmFactor + tempFactor));
     },
     iso: (x) => {
-      // Iso-cost line (constant cost)
-      return 120 + (x - 60) * 0.2;
+      // Iso-cost line through the recommended point, from the backend cost model's trade-off between the two axes
+      if (!costSlopes || costSlopes.axes !== currentAxes) return 120 + (x - 60) * 0.2;
+      return costSlopes.y0 - (costSlopes.x / costSlopes.y) * (x - costSlopes.x0);
     }
   };
 
@@ -1600,19 +1845,78 @@ function updateMonitoringPanel() {
   updateElement('qSalt', salt.toFixed(2));
   updateElement('qTemp', Math.round(userInputs.temperature + Math.random() * 10 - 5));
 
-  // Calculate energy consumption based on inputs
-  const baseEnergy = 500;
-  const flowFactor = userInputs.flowRate / 50000;
-  const tempFactor = userInputs.temperature / 120;
-  const voltageFactor = userInputs.voltage / 28;
+  refreshOperatingCost();
+}
+
+// Heating plus grid energy and the iso-cost slope from the backend cost model and the configured tariffs
+let costSlopes = null;
 
-  const currentEnergy = Math.round(baseEnergy * flowFactor * tempFactor * voltageFactor);
-  const avgEnergy = Math.round(currentEnergy * 0.95);
-  const peakEnergy = Math.round(currentEnergy * 1.2);
+// Cost-model fields on the x and y axes of each decision-map view, and the step used for its slope
+const AXIS_FIELDS = {
+  ppm_T: ['ppm', 'temp'],
+  ppm_V: ['ppm', 'voltage'],
+  wash_T: ['wash', 'temp'],
+  wash_V: ['wash', 'voltage'],
+  flow_wash: ['flow', 'wash']
+};
+const COST_STEPS = { flow: 1000, temp: 1, voltage: 1, ppm: 1, wash: 0.1 };
+
+async function refreshOperatingCost() {
+  const axes = (typeof state !== 'undefined' && state.axes) || 'ppm_T';
+  const [xField, yField] = AXIS_FIELDS[axes];
+  const current = {
+    flow: userInputs.flowRate || 30000,
+    temp: userInputs.temperature || 120,
+    voltage: userInputs.voltage || 75,
+    ppm: userInputs.demulsifierPPM || 60,
+    wash: userInputs.washWaterPercent || 2.0
+  };
+  const recommended = {
+    ...current,
+    temp: calculationResults.optimizedTemp || current.temp,
+    voltage: calculationResults.optimizedVoltage || current.voltage,
+    ppm: calculationResults.optimizedPPM || current.ppm,
+    wash: calculationResults.optimizedWash || current.wash
+  };
+  const body = {
+    points: [
+      current,
+      recommended,
+      { ...recommended, [xField]: recommended[xField] + COST_STEPS[xField] },
+      { ...recommended, [yField]: recommended[yField] + COST_STEPS[yField] }
+    ],
+    tariffs: (userInputs.rawInputs && userInputs.rawInputs.tariffs) || null
+  };
+  try {
+    const res = await fetch('/api/cost', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    });
+    if (!res.ok) return;
+    const cost = await res.json();
+    const perBbl = cost.cost_per_bbl;
+    const previousAxes = costSlopes && costSlopes.axes;
+    costSlopes = {
+      axes,
+      x0: recommended[xField],
+      y0: recommended[yField],
+      x: (perBbl[2] - perBbl[1]) / COST_STEPS[xField],
+      y: (perBbl[3] - perBbl[1]) / COST_STEPS[yField]
+    };
+    if (!costSlopes.y) costSlopes = null;
+    // The map was drawn before the slopes for this view arrived
+    if (costSlopes && previousAxes !== axes && map && ctx) updateDecisionMap();
 
-  updateElement('enNow', currentEnergy);
-  updateElement('enAvg', avgEnergy);
-  updateElement('enPeak', peakEnergy);
+    // kWh per hour at the current point; live KPIs replace these once the energy tag streams
+    if (kpisShown && !demoTicker) return;
+    const currentEnergy = cost.energy_kwh_per_day[0] / 24;
+    updateElement('enNow', Math.round(currentEnergy));
+    updateElement('enAvg', Math.round(currentEnergy * 0.95));
+    updateElement('enPeak', Math.round(currentEnergy * 1.2));
+  } catch (err) {
+    console.warn('Cost model unavailable:', err);
+  }
 }
 
 // Update prediction panel with calculated data
@@ -1633,6 +1937,13 @@ function initializeCalculations() {
   updateMonitoringPanel();
   updatePredictionPanel();
 
+  fetchOptimizationResults().then(ok => {
+    if (!ok) return;
+    updateOptimizationPanel();
+    updateMonitoringPanel();
+    if (map && ctx) updateDecisionMap();
+  });
+
   // Initialize decision map with a slight delay to ensure canvas is ready
   setTimeout(() => {
     const decisionMapCanvas = document.getElementById('decisionMap');
@@ -1674,8 +1985,12 @@ document.addEventListener('DOMContentLoaded', () => {
     setTimeout(() => {
       updateWhatIfChart();
       updateSaltPredictionChart();
+      refreshForecasts();
     }, 200);
 
+    // Forecasts move once per closed hour; poll well inside that
+    setInterval(refreshForecasts, 60000);
+
     // Calculations initialized successfully
 
   }, 100);
@@ -1692,6 +2007,7 @@ function initializePredictionDashboard() {
 
   // Initialize time to breach gauges
   updateTimeToBreach();
+  refreshBreachRisk();
 
   // Initialize what-if controls
   initializeWhatIfControls();
@@ -1703,11 +2019,38 @@ function initializePredictionDashboard() {
   setInterval(updatePredictionMetrics, 15000); // Update every 15 seconds
 }
 
-// Update breach probabilities with realistic data
-function updateBreachProbabilities() {
-  // Simulate realistic breach probabilities
-  const bswProb = 0.5; // 0.5%
-  const saltProb = 0.0; // 0.0%
+// Fetch the Monte Carlo breach forecast (live tag values, else the input baseline)
+async function refreshBreachRisk() {
+  const body = {
+    spec_bsw: userInputs.targetBSW || 0.5,
+    spec_salt: userInputs.targetSalt || 0.25
+  };
+  if (demoTicker && userInputs.flowRate) {
+    body.point = {
+      flow: userInputs.flowRate,
+      temp: userInputs.temperature,
+      voltage: userInputs.voltage,
+      ppm: userInputs.demulsifierPPM,
+      wash: userInputs.washWaterPercent
+    };
+  }
+  try {
+    const res = await fetch('/api/breach', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    });
+    if (!res.ok) return;
+    const forecast = await res.json();
+    updateBreachProbabilities(forecast.bsw.p_horizon * 100, forecast.salt.p_horizon * 100);
+    updateTimeToBreach(forecast.bsw, forecast.salt);
+  } catch (err) {
+    console.warn('Breach forecast failed:', err);
+  }
+}
+
+// Update breach probabilities (percent over the forecast horizon)
+function updateBreachProbabilities(bswProb = 0.5, saltProb = 0.0) {
 
   // Update BS&W breach probability
   const bswElement = document.getElementById('bswBreachProb');
@@ -1765,13 +2108,19 @@ function updateBreachProbabilities() {
   }
 }
 
-// Update time to breach gauges
-function updateTimeToBreach() {
-  // BS&W time to breach (simulated as safe - no breach expected)
-  updateBreachGauge('bsw', 100, 'Safe');
+// Update time to breach gauges from the per-quantity breach forecasts
+function updateTimeToBreach(bsw = null, salt = null) {
+  updateBreachGauge('bsw', ...gaugeFromForecast(bsw, 'Safe'));
+  updateBreachGauge('salt', ...gaugeFromForecast(salt, 'Excellent'));
+}
 
-  // Salt time to breach (simulated as excellent - no breach expected)
-  updateBreachGauge('salt', 100, 'Excellent');
+// The gauge spans 0-240 minutes; unlikely or distant breaches read as safe
+function gaugeFromForecast(forecast, safeLabel) {
+  const minutes = forecast && forecast.expected_minutes_to_breach;
+  if (!forecast || minutes === null || forecast.p_horizon < 0.05 || minutes >= 240) {
+    return [100, safeLabel];
+  }
+  return [Math.max(0, 100 - minutes / 2.4), minutes < 60 ? 'Critical' : 'Warning'];
 }
 
 // Update individual breach gauge
@@ -2216,22 +2565,24 @@ function updateSaltPredictionChart() {
   const flowImpact = (scenarioFlow - currentFlow) * 0.000002; // Higher flow = slightly higher salt
   const totalScenarioImpact = ppmImpact + tempImpact + voltageImpact + washImpact + flowImpact;
 
-  // Generate 24-hour data points with realistic variations
+  // 24-hour forecast of the measured salt, flat at the base value until one is available
+  const forecast = forecastSeries('salt');
   for (let i = 0; i <= 24; i++) {
-    // Add realistic time-based variations
-    const timeVariation = Math.sin((i / 24) * Math.PI * 2) * 0.03 + 
-                         Math.sin((i / 12) * Math.PI * 2) * 0.015 + 
-                         (Math.random() - 0.5) * 0.02;
-    
-    // Current settings (baseline with natural variations)
-    const currentValue = Math.max(0.0, Math.min(1.0, baseValue + timeVariation));
+    const expected = forecast ? forecast.value[i] : baseValue;
+
+    // Current settings follow the forecast
+    const currentValue = Math.max(0.0, Math.min(1.0, expected));
     currentData.push(currentValue);
 
     // Scenario with what-if parameters
-    const scenarioValue = Math.max(0.0, Math.min(1.0, baseValue + totalScenarioImpact + timeVariation * 0.7));
+    const scenarioValue = Math.max(0.0, Math.min(1.0, expected + totalScenarioImpact));
     scenarioData.push(scenarioValue);
   }
 
+  if (forecast) {
+    drawForecastBand(ctx, forecast.lower, forecast.upper, width, height, 'rgba(100, 116, 139, 0.12)', 1.0);
+  }
+
   // Draw current settings line (smooth curve)
   drawSmoothLine(ctx, currentData, width, height, '#64748b', 'rgba(148, 163, 184, 0.3)', 'Current Settings', 1.0);
 
@@ -2309,22 +2660,24 @@ function updateWhatIfChart() {
   const maxImpact = Math.abs(baseValue) * 0.2;
   const clampedImpact = Math.max(-maxImpact, Math.min(maxImpact, totalScenarioImpact));
 
-  // Generate 24-hour data points with realistic variations
+  // 24-hour forecast of the measured BS&W, flat at the calculated value until one is available
+  const forecast = forecastSeries('bsw');
   for (let i = 0; i <= 24; i++) {
-    // Add realistic time-based variations (daily operational patterns)
-    const timeVariation = Math.sin((i / 24) * Math.PI * 2) * 0.02 + 
-                         Math.sin((i / 12) * Math.PI * 2) * 0.01 + 
-                         (Math.random() - 0.5) * 0.01;
-    
-    // Current settings (baseline with natural variations)
-    const currentValue = Math.max(0.0, Math.min(0.8, baseValue + timeVariation));
+    const expected = forecast ? forecast.value[i] : baseValue;
+
+    // Current settings follow the forecast
+    const currentValue = Math.max(0.0, Math.min(0.8, expected));
     currentData.push(currentValue);
 
     // Scenario with what-if parameters (using clamped impact for reasonable values)
-    const scenarioValue = Math.max(0.0, Math.min(0.8, baseValue + clampedImpact + timeVariation * 0.7));
+    const scenarioValue = Math.max(0.0, Math.min(0.8, expected + clampedImpact));
     scenarioData.push(scenarioValue);
   }
 
+  if (forecast) {
+    drawForecastBand(ctx, forecast.lower, forecast.upper, width, height, 'rgba(100, 116, 139, 0.12)');
+  }
+
   // Draw current settings line (smooth curve)
   drawSmoothLine(ctx, currentData, width, height, '#64748b', 'rgba(148, 163, 184, 0.3)', 'Current Settings');
 
@@ -2337,6 +2690,49 @@ function updateWhatIfChart() {
 
 }
 
+// Latest hourly forecasts per tag from /api/forecast (null until the tag has history)
+const forecasts = { bsw: null, salt: null };
+
+async function refreshForecasts() {
+  await Promise.all(Object.keys(forecasts).map(async tag => {
+    try {
+      const res = await fetch(`/api/forecast/${tag}?horizon=24`);
+      forecasts[tag] = res.ok ? await res.json() : null;
+    } catch (err) {
+      forecasts[tag] = null;
+    }
+  }));
+  updateWhatIfChart();
+  updateSaltPredictionChart();
+}
+
+// 25 chart points for a tag: the last closed hour followed by the 24 forecast hours
+function forecastSeries(tag) {
+  const forecast = forecasts[tag];
+  if (!forecast) return null;
+  const last = forecast.last.value;
+  return {
+    value: [last, ...forecast.value],
+    lower: [last, ...forecast.lower],
+    upper: [last, ...forecast.upper]
+  };
+}
+
+// Helper function to shade a confidence band between two series
+function drawForecastBand(ctx, lower, upper, width, height, fillColor, maxValue = 0.8) {
+  const x = index => 60 + (index / 24) * (width - 80);
+  const y = value => height - 50 - (Math.max(0, Math.min(maxValue, value)) / maxValue) * (height - 80);
+
+  ctx.fillStyle = fillColor;
+  ctx.beginPath();
+  upper.forEach((value, index) => ctx.lineTo(x(index), y(value)));
+  for (let index = lower.length - 1; index >= 0; index--) {
+    ctx.lineTo(x(index), y(lower[index]));
+  }
+  ctx.closePath();
+  ctx.fill();
+}
+
 // Helper function to draw smooth curved lines
 function drawSmoothLine(ctx, data, width, height, strokeColor, fillColor, label, maxValue = 0.8) {
   const points = data.map((value, index) => ({
@@ -2409,34 +2805,31 @@ function drawDataPoints(ctx, data, width, height, fillColor, strokeColor, maxVal
 }
 
 // Retrain prediction model
-function retrainPredictionModel() {
+async function retrainPredictionModel() {
   showToast('Retraining prediction model...', 'info');
 
-  // Simulate retraining process
-  setTimeout(() => {
-    showToast('Prediction model retrained successfully!', 'success');
+  try {
+    const res = await fetch('/api/model/retrain', { method: 'POST' });
+    const result = await res.json();
+    if (!res.ok) throw new Error(result.error || `HTTP ${res.status}`);
 
-    // Update some metrics to show the effect
-    updateBreachProbabilities();
-    updateTimeToBreach();
+    if (result.published) {
+      showToast(`Prediction model v${result.version} trained on ${result.rows.toLocaleString()} new samples`, 'success');
+    } else {
+      showToast(`No new samples since the last retrain (model v${result.version})`, 'info');
+    }
 
-    console.log('Prediction model retrained');
-  }, 3000);
+    // Update some metrics to show the effect
+    refreshBreachRisk();
+    updateWhatIfChart();
+    updateSaltPredictionChart();
+  } catch (err) {
+    console.error('Retraining failed:', err);
+    showToast('Retraining failed: ' + err.message, 'error');
+  }
 }
 
 // Update prediction metrics periodically
 function updatePredictionMetrics() {
-  // Add small random variations to make it look real-time
-  const bswElement = document.getElementById('bswBreachProb');
-  if (bswElement) {
-    const currentValue = parseFloat(bswElement.textContent);
-    const newValue = Math.max(0, Math.min(2, currentValue + (Math.random() - 0.5) * 0.1));
-    bswElement.textContent = newValue.toFixed(1) + '%';
-
-    // Update fill bar
-    const bswFill = document.querySelector('.bsw-fill');
-    if (bswFill) {
-      bswFill.style.width = newValue + '%';
-    }
-  }
+  refreshBreachRisk();
 }
@@ -176,4 +176,7 @@ def main():
         input("Press Enter to exit...")
 
 if __name__ == "__main__":
+    # Needed by the optimizer's process pool in frozen executables
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()